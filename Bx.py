@@ -1,27 +1,275 @@
 import eventlet
 eventlet.monkey_patch()
+import eventlet.queue
+import eventlet.wsgi
+import greenlet
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, jsonify, request, make_response, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
 import json
+import logging
+import logging.handlers
 import os
 import threading
+from functools import wraps
+import uuid
+import decimal
+from collections import deque, OrderedDict
+import heapq
+import math
+import hashlib
+import importlib.util
 import time
+import random
 from datetime import datetime
 import sys
 import gzip
+import base64
 from io import BytesIO
 import brotli
-import pathlib
+import sqlite3
+from eventlet import tpool
+import numpy as np
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, make_wsgi_app, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily
+import socket
+from urllib.parse import urlsplit, parse_qs, urlencode
+from email.utils import parsedate_to_datetime
 
 # Ensure Windows console supports UTF-8 output
 sys.stdout.reconfigure(encoding='utf-8')
 
+# Samples of history kept in memory per tracked pair
+PAIR_HISTORY_ENTRIES = int(os.environ.get("PAIR_HISTORY_ENTRIES", 3000))
+# Samples the in-memory buffers start with; they double up to the capacity
+PAIR_HISTORY_INITIAL = int(os.environ.get("PAIR_HISTORY_INITIAL", 256))
+
+# Full snapshots kept per pair as diff bases for Socket.IO patch mode
+PATCH_HISTORY = int(os.environ.get("PATCH_HISTORY", 10))
+
+# Process role: "all" fetches and serves in one process, "ingest" only
+# fetches and publishes snapshots, "web" serves what ingest publishes
+BX_ROLE = os.environ.get("BX_ROLE", "all")
+
+# Blocking work (SQLite, console writes) runs on real OS threads next to
+# the eventlet hub
+real_threading = eventlet.patcher.original("threading")
+real_queue = eventlet.patcher.original("queue")
+real_time = eventlet.patcher.original("time")
+
+# =============================================
+# LOGGING
+# =============================================
+# Records go through a bounded queue to a real thread that writes the
+# console, so no green thread waits on stdout. Below WARNING they can be
+# sampled per level and per source (LOG_SAMPLE="DEBUG=0.1,fetch=0.5");
+# warnings and errors are always kept. Recent records stay in a ring
+# buffer served by /api/logs.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+LOG_BUFFER_SIZE = int(os.environ.get("LOG_BUFFER_SIZE", 2000))
+LOG_SAMPLE = os.environ.get("LOG_SAMPLE", "")
+
+log = logging.getLogger("kluxback")
+fetch_log = log.getChild("fetch")
+upstream_log = log.getChild("upstream")
+storage_log = log.getChild("storage")
+socket_log = log.getChild("socket")
+bus_log = log.getChild("bus")
+
+def log_source(record):
+    return record.name[len("kluxback."):] if record.name.startswith("kluxback.") else record.name
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, spec):
+        super().__init__()
+        self.rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, _, rate = item.partition("=")
+            self.rates[key.strip()] = float(rate)
+        self.sampled_out = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = min(self.rates.get(record.levelname, 1.0), self.rates.get(log_source(record), 1.0))
+        if rate >= 1 or random.random() < rate:
+            return True
+        self.sampled_out[record.levelname] = self.sampled_out.get(record.levelname, 0) + 1
+        return False
+
+class JSONLogFormatter(logging.Formatter):
+    def format(self, record):
+        entry = log_entry(record)
+        if record.exc_info:
+            entry["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return dumps_bytes(entry).decode()
+
+def log_entry(record):
+    return {
+        "ts": record.created,
+        "level": record.levelname,
+        "source": log_source(record),
+        "message": record.getMessage(),
+    }
+
+class LogPipeline(logging.handlers.QueueHandler):
+    # Keeps the ring buffer and hands records to the console thread; a
+    # full queue drops the console line rather than block the caller
+    def __init__(self):
+        super().__init__(real_queue.Queue(LOG_QUEUE_SIZE))
+        self.recent = deque(maxlen=LOG_BUFFER_SIZE)
+        self.dropped = 0
+        self.sampling = SamplingFilter(LOG_SAMPLE)
+        self.addFilter(self.sampling)
+        self.formatter = JSONLogFormatter() if LOG_FORMAT == "json" else logging.Formatter(
+            "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+        )
+        self.writer = real_threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def createLock(self):
+        # Taken by green threads and by the history writer's real thread
+        self.lock = real_threading.RLock()
+
+    def prepare(self, record):
+        # Same process: the record is formatted on the writer thread
+        return record
+
+    def emit(self, record):
+        # The buffer keeps the formatted entry, not the record: exc_info and
+        # args would pin traceback frames and their locals
+        entry = log_entry(record)
+        if record.exc_info:
+            entry["exc"] = record.exc_text = self.formatter.formatException(record.exc_info)
+        self.recent.append((record.levelno, entry))
+        try:
+            self.enqueue(record)
+        except real_queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self):
+        while True:
+            record = self.queue.get()
+            try:
+                sys.stdout.write(self.formatter.format(record) + "\n")
+                sys.stdout.flush()
+            except Exception:
+                pass
+            # Don't hold the last record's traceback while waiting for the next
+            del record
+
+    def query(self, level=logging.NOTSET, source=None, since=None, limit=200):
+        matches = [
+            entry for levelno, entry in list(self.recent)
+            if levelno >= level
+            and (source is None or entry["source"] == source)
+            and (since is None or entry["ts"] > since)
+        ]
+        return matches[-limit:]
+
+    def stats(self):
+        return {
+            "level": logging.getLevelName(log.getEffectiveLevel()),
+            "buffered": len(self.recent),
+            "queued": self.queue.qsize(),
+            "dropped": self.dropped,
+            "sampledOut": dict(self.sampling.sampled_out),
+        }
+
+log_pipeline = LogPipeline()
+log.addHandler(log_pipeline)
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+
+# Socket.IO / Engine.IO packet logs are off unless asked for; when on they
+# go through the same pipeline
+SOCKETIO_LOGGER = os.environ.get("SOCKETIO_LOGGER", "0") == "1"
+ENGINEIO_LOGGER = os.environ.get("ENGINEIO_LOGGER", "0") == "1"
+
+# Additional Socket.IO origins, e.g. a local benchmark client
+SOCKETIO_EXTRA_ORIGINS = [o for o in os.environ.get("SOCKETIO_EXTRA_ORIGINS", "").split(",") if o]
+
+# Web workers sit behind gunicorn without sticky sessions, so a long-polling
+# session's requests would land on different workers ("Invalid session").
+# The web role therefore accepts WebSocket only; clients must connect with
+# transports: ["websocket"].
+SOCKETIO_TRANSPORTS = os.environ.get(
+    "SOCKETIO_TRANSPORTS", "websocket" if BX_ROLE == "web" else "polling,websocket"
+).split(",")
+
+# ✅ JSON serialization: orjson when installed, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def json_default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_bytes(obj):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=json_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def loads_json(data):
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads_json(s)
+
+    def response(self, *args, **kwargs):
+        # Flask's payload rules, without its str round trip: a single
+        # positional argument is the payload, otherwise the args or kwargs
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+class SocketJSON:
+    # json module stand-in for Socket.IO packets. A snapshot broadcast to
+    # several rooms is packed as [event, payload] once per emit, so the
+    # encoded payload of the last few objects is reused. Emitted payloads
+    # are never mutated afterwards, and holding them keeps ids unique.
+    def __init__(self, size=8):
+        self.recent = deque(maxlen=size)
+
+    def dumps(self, obj, **kwargs):
+        if isinstance(obj, list) and len(obj) == 2 and isinstance(obj[0], str) and isinstance(obj[1], dict):
+            payload = obj[1]
+            for cached, encoded in self.recent:
+                if cached is payload:
+                    break
+            else:
+                encoded = dumps_bytes(payload).decode("utf-8")
+                self.recent.append((payload, encoded))
+            return f"[{dumps_bytes(obj[0]).decode('utf-8')},{encoded}]"
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads_json(s)
+
 # ✅ Initialize Flask
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'abc123'
+app.json = FastJSONProvider(app)
 
 # ✅ CORS setup
 CORS(app, origins=[
@@ -39,19 +287,113 @@ socketio = SocketIO(
         "http://localhost:5173",
         "http://localhost:3000",
         "https://dashboard-void-shell.vercel.app"
-    ],
+    ] + SOCKETIO_EXTRA_ORIGINS,
     async_mode="eventlet",
-    logger=True,
-    engineio_logger=True,
+    json=SocketJSON(),
+    logger=log.getChild("socketio") if SOCKETIO_LOGGER else False,
+    engineio_logger=log.getChild("engineio") if ENGINEIO_LOGGER else False,
+    transports=SOCKETIO_TRANSPORTS,
     ping_timeout=60,
     ping_interval=25
 )
 
+# =============================================
+# METRICS
+# =============================================
+# Exposed in the Prometheus text format on /metrics. In the split
+# deployment the ingest process serves its own on INGEST_METRICS_PORT.
+STARTED_AT = time.time()
+INGEST_METRICS_PORT = int(os.environ.get("INGEST_METRICS_PORT", 9105))
+
+metrics_registry = CollectorRegistry()
+
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 15)
+PHASE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "kluxback_upstream_request_seconds", "Upstream HTTP request latency by host and status",
+    ["host", "status"], buckets=UPSTREAM_BUCKETS, registry=metrics_registry,
+)
+SOURCE_FETCH_SECONDS = Histogram(
+    "kluxback_source_fetch_seconds", "Source fetch latency within a tick by outcome",
+    ["source", "outcome"], buckets=UPSTREAM_BUCKETS, registry=metrics_registry,
+)
+TICK_SECONDS = Histogram(
+    "kluxback_tick_seconds", "Duration of one fetch_all_data tick",
+    buckets=PHASE_BUCKETS + (10, 15), registry=metrics_registry,
+)
+TICK_PHASE_SECONDS = Histogram(
+    "kluxback_tick_phase_seconds", "Time spent per fetch_all_data phase",
+    ["phase"], buckets=PHASE_BUCKETS, registry=metrics_registry,
+)
+TICKS = Counter(
+    "kluxback_ticks", "Ticks by outcome (saved, skipped, error)",
+    ["outcome"], registry=metrics_registry,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "kluxback_http_request_seconds", "API request latency by route",
+    ["method", "route", "status"], registry=metrics_registry,
+)
+
+def observe_phase(phase, started):
+    now = time.perf_counter()
+    TICK_PHASE_SECONDS.labels(phase).observe(now - started)
+    return now
+
+class RuntimeCollector:
+    # Gauges read from live state at scrape time
+    def collect(self):
+        now = time.time()
+        yield GaugeMetricFamily("kluxback_uptime_seconds", "Seconds since the process started", value=now - STARTED_AT)
+
+        sockets = GaugeMetricFamily("kluxback_socket_clients", "Connected Socket.IO clients by mode", labels=["mode"])
+        modes = {}
+        for client in list(socket_clients.values()):
+            modes[client["mode"]] = modes.get(client["mode"], 0) + 1
+        for mode, count in modes.items():
+            sockets.add_metric([mode], count)
+        yield sockets
+
+        boxes = list(outboxes.values())
+        yield GaugeMetricFamily("kluxback_outbox_pending", "Messages waiting in client outboxes", value=sum(len(b.pending) for b in boxes))
+        yield GaugeMetricFamily("kluxback_outbox_max_lag_seconds", "Age of the oldest undelivered message", value=max([b.lag_seconds() for b in boxes] or [0]))
+
+        pairs = pair_registry.all()
+        yield GaugeMetricFamily("kluxback_tracked_pairs", "Pairs being tracked", value=len(pairs))
+        storage = GaugeMetricFamily("kluxback_storage_bytes", "Ring buffer bytes per pair", labels=["pair"])
+        points = GaugeMetricFamily("kluxback_storage_points", "Samples held per pair", labels=["pair"])
+        age = GaugeMetricFamily("kluxback_source_last_success_age_seconds", "Seconds since a source last answered", labels=["pair", "source"])
+        for pair in pairs:
+            storage.add_metric([pair.pair_address], pair.storage.nbytes())
+            points.add_metric([pair.pair_address], len(pair.storage))
+            for name, source in list(pair.sources.items()):
+                if source.last_success:
+                    age.add_metric([pair.pair_address, name], now - source.last_success)
+        yield storage
+        yield points
+        yield age
+
+        breakers = GaugeMetricFamily("kluxback_circuit_open", "1 while a host's circuit is open", labels=["host"])
+        for client in list(upstream.clients.values()):
+            breakers.add_metric([client.host], 1 if client.breaker.state == "open" else 0)
+        yield breakers
+
+metrics_registry.register(RuntimeCollector())
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
 # Add CORS headers to all responses
 @app.after_request
 def after_request(response):
+    started = g.get("request_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_REQUEST_SECONDS.labels(request.method, route, response.status_code).observe(time.perf_counter() - started)
     response.headers.add('Access-Control-Allow-Origin', 'https://dashboard-void-shell-i7s0d7g3z-saisuryacharan89s-projects.vercel.app')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,If-None-Match')
+    response.headers.add('Access-Control-Expose-Headers', 'ETag,X-Snapshot-Version,X-Next-Cursor')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     response.headers.add('Access-Control-Allow-Credentials', 'true')
     return response
@@ -62,36 +404,541 @@ def options_response(path):
     return jsonify({'status': 'ok'}), 200
 
 # =============================================
-# SIMPLE IN-MEMORY STORAGE
+# IN-MEMORY TIME-SERIES STORAGE
 # =============================================
-class SimpleStorage:
-    def __init__(self):
-        self.data = []
-        self.max_entries = 200
-    
-    def save(self, new_data):
-        self.data.append(new_data)
-        if len(self.data) > self.max_entries:
-            self.data = self.data[-self.max_entries:]
-        print(f"💾 Saved data point. Total: {len(self.data)}")
-    
+# Streaming indicator windows as "label:seconds" lists; labels become part
+# of the column names, so they must be plain identifiers
+def parse_window_spec(spec):
+    windows = {}
+    for item in spec.split(","):
+        label, _, seconds = item.strip().partition(":")
+        if label and seconds:
+            windows[label] = float(seconds)
+    return windows
+
+INDICATOR_EMA = parse_window_spec(os.environ.get("INDICATOR_EMA", "1m:60,5m:300"))
+INDICATOR_SMA = parse_window_spec(os.environ.get("INDICATOR_SMA", "5m:300"))
+INDICATOR_WINDOWS = parse_window_spec(os.environ.get("INDICATOR_WINDOWS", "1m:60,5m:300,15m:900"))
+INDICATOR_RATES = ["buyPressure", "buySellRatio", "holderGrowth", "viewsVelocity", "engagementVelocity"]
+INDICATOR_FIELDS = (
+    [f"mcEma{label}" for label in INDICATOR_EMA]
+    + [f"mcSma{label}" for label in INDICATOR_SMA]
+    + [f"{rate}{label}" for label in INDICATOR_WINDOWS for rate in INDICATOR_RATES]
+)
+
+# Numeric fields kept per sample: (column, snapshot section, dtype).
+# A section of None means the value lives at the top level of the snapshot.
+SERIES_FIELDS = [
+    ("marketCapUSD", "axiom", np.float64),
+    ("marketCapSol", "axiom", np.float64),
+    ("fibLevel62", "axiom", np.float64),
+    ("fibLevel50", "axiom", np.float64),
+    ("volumeSol", "axiom", np.float64),
+    ("volumeUSD", "axiom", np.float64),
+    ("netCount", "axiom", np.int64),
+    ("buyVolumeSol", "axiom", np.float64),
+    ("buyVolumeUSD", "axiom", np.float64),
+    ("sellVolumeSol", "axiom", np.float64),
+    ("sellVolumeUSD", "axiom", np.float64),
+    ("buyCount", "axiom", np.int64),
+    ("sellCount", "axiom", np.int64),
+    ("liquidityUSD", "axiom", np.float64),
+    ("numHolders", "axiom", np.int64),
+    ("totalHolders", "axiom", np.int64),
+    ("solPriceUSD", "axiom", np.float64),
+    ("views", "social", np.int64),
+    ("likes", "social", np.int64),
+    ("retweets", "social", np.int64),
+    ("replies", "social", np.int64),
+    ("memberCount", "social", np.int64),
+    ("unique_authors", None, np.int64),
+] + [(name, "indicators", np.float64) for name in INDICATOR_FIELDS]
+
+# Chart projections materialized on save: view -> (rows kept, {output key: column})
+CHART_VIEWS = {
+    "marketcap": (100, {
+        "marketCapUSD": "marketCapUSD",
+        "marketCapSol": "marketCapSol",
+        "volumeUSD": "volumeUSD",
+    }),
+    "buys-sells": (50, {
+        "buyVolume": "buyVolumeUSD",
+        "sellVolume": "sellVolumeUSD",
+        "netVolume": "volumeUSD",
+        "buyCount": "buyCount",
+        "sellCount": "sellCount",
+    }),
+    "social": (50, {
+        "views": "views",
+        "likes": "likes",
+        "retweets": "retweets",
+        "replies": "replies",
+        "uniqueAuthors": "unique_authors",
+    }),
+    "holders": (100, {
+        "value": "numHolders",
+        "marketCap": "marketCapUSD",
+        "uniqueAuthors": "unique_authors",
+    }),
+    "indicators": (100, {name: name for name in INDICATOR_FIELDS}),
+}
+
+def series_values(snapshot):
+    # Numeric fields of a snapshot; missing floats stay None, missing counts are 0
+    values = {}
+    for name, section, dtype in SERIES_FIELDS:
+        value = (snapshot.get(section) or {}).get(name) if section else snapshot.get(name)
+        if value is None and dtype is not np.float64:
+            value = 0
+        values[name] = value
+    return values
+
+def series_rows(lists):
+    # Snapshot-shaped rows from {"ts": [...], column: [...]} lists
+    rows = []
+    for i, ts in enumerate(lists["ts"]):
+        row = {"timestamp": datetime.fromtimestamp(ts).isoformat(), "axiom": {}, "social": {}, "indicators": {}}
+        for name, section, _ in SERIES_FIELDS:
+            if section:
+                row[section][name] = lists[name][i]
+            else:
+                row[name] = lists[name][i]
+        rows.append(row)
+    return rows
+
+def chart_rows(lists, fields):
+    # Chart rows from column lists; fields maps output key -> column
+    rows = []
+    for i, ts in enumerate(lists["ts"]):
+        timestamp = datetime.fromtimestamp(ts)
+        row = {"timestamp": timestamp.isoformat(), "time": timestamp.strftime("%H:%M")}
+        for key, column in fields.items():
+            row[key] = lists[column][i]
+        rows.append(row)
+    return rows
+
+def column_list(values):
+    # NaN marks a missing float sample and is served as null
+    return [None if v != v else v for v in values.tolist()]
+
+# Column that drives downsampling for each history route
+CHART_PRIMARY = {
+    "history": "marketCapUSD",
+    "marketcap": "marketCapUSD",
+    "buys-sells": "volumeUSD",
+    "social": "views",
+    "holders": "numHolders",
+    "indicators": "marketCapUSD",
+}
+
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the first and last point and, per
+    # bucket, the point forming the largest triangle with the previous pick
+    # and the average of the next bucket
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1][:threshold])
+    y = np.nan_to_num(y)
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    picks = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picks.append(a)
+    picks.append(n - 1)
+    return np.array(picks)
+
+def minmax_indices(x, y, threshold):
+    # Min and max of each bucket, so spikes survive downsampling
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 2:
+        # No room for a min/max pair; LTTB keeps just the first point
+        return lttb_indices(x, y, threshold)
+    y = np.nan_to_num(y)
+    picks = set()
+    for bucket in np.array_split(np.arange(n), max(1, threshold // 2)):
+        if len(bucket):
+            picks.add(int(bucket[np.argmin(y[bucket])]))
+            picks.add(int(bucket[np.argmax(y[bucket])]))
+    return np.array(sorted(picks))
+
+DOWNSAMPLERS = {"lttb": lttb_indices, "minmax": minmax_indices}
+
+class TimeSeriesStore:
+    # Fixed-capacity ring buffer of numeric columns. Until it first fills,
+    # samples are appended in order to columns that double on demand. From
+    # then on every sample is written twice (at i and i + capacity) so the
+    # newest n samples are always one contiguous slice: appends are amortized
+    # O(1) and window reads are zero-copy views.
+    def __init__(self, capacity=PAIR_HISTORY_ENTRIES, pair_address=None):
+        self.capacity = max(0, int(capacity))
+        self.pair_address = pair_address
+        self.count = 0
+        self.latest = {}
+        # Every save bumps the version; response bodies are cached per version
+        self.token = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.updated = threading.Condition()
+        self.response_cache = {}
+        self.response_cache_version = 0
+        self.recent = deque(maxlen=PATCH_HISTORY)
+        size = min(self.capacity, PAIR_HISTORY_INITIAL)
+        self.columns = {"ts": np.zeros(size, dtype=np.float64)}
+        for name, _, dtype in SERIES_FIELDS:
+            self.columns[name] = np.zeros(size, dtype=dtype)
+        self.views = {
+            view: deque(maxlen=min(length, self.capacity))
+            for view, (length, _) in CHART_VIEWS.items()
+        }
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def save(self, snapshot, version=None):
+        self.version = self.version + 1 if version is None else version
+        snapshot["version"] = self.version
+        self.latest = snapshot
+        self.recent.append(snapshot)
+        with self.updated:
+            self.updated.notify_all()
+        if not self.capacity:
+            return
+
+        # Samples already restored from disk are not appended twice
+        ts = datetime.fromisoformat(snapshot["timestamp"]).timestamp()
+        if len(self) and ts <= self.columns["ts"][(self.count - 1) % self.capacity]:
+            return
+        self.append(ts, series_values(snapshot))
+        storage_log.debug(f"💾 Saved data point. Total: {len(self)}")
+
+    def mirror(self, snapshot, token):
+        # Snapshot published by the ingest process, kept under its version
+        # and token so ETags and patch bases agree across web workers
+        if token == self.token and snapshot.get("version", 0) <= self.version:
+            return False
+        if token != self.token:
+            self.token = token
+            self.recent.clear()
+            self.response_cache = {}
+            self.response_cache_version = None
+        self.save(snapshot, snapshot.get("version", 0))
+        return True
+
+    def carry_forward(self, ts, values, version=None):
+        # Sample for a tick that kept the latest snapshot. The series routes
+        # change, so the version moves on (new ETags, long-polls wake) while
+        # the latest snapshot keeps its own version.
+        if not self.capacity or (len(self) and ts <= self.columns["ts"][(self.count - 1) % self.capacity]):
+            return False
+        self.append(ts, values)
+        self.version = self.version + 1 if version is None else max(self.version, version)
+        with self.updated:
+            self.updated.notify_all()
+        return True
+
+    def append(self, ts, values):
+        if self.count < self.capacity:
+            self._append_linear(ts, values)
+        else:
+            i = self.count % self.capacity
+            self.columns["ts"][i] = self.columns["ts"][i + self.capacity] = ts
+            for name, _, _ in SERIES_FIELDS:
+                value = values[name]
+                column = self.columns[name]
+                column[i] = column[i + self.capacity] = np.nan if value is None else value
+        self.count += 1
+        if self.count == self.capacity:
+            # Full for the first time: switch to the mirrored layout
+            self.columns = {name: np.concatenate((column, column)) for name, column in self.columns.items()}
+
+        # Chart rows are formatted once here so the routes only serialize them
+        timestamp = datetime.fromtimestamp(ts)
+        stamp = {"timestamp": timestamp.isoformat(), "time": timestamp.strftime("%H:%M")}
+        for view, (_, fields) in CHART_VIEWS.items():
+            row = dict(stamp)
+            for key, column in fields.items():
+                row[key] = values[column]
+            self.views[view].append(row)
+
+    def _append_linear(self, ts, values):
+        i = self.count
+        if i == len(self.columns["ts"]):
+            size = min(self.capacity, max(1, 2 * i))
+            for name, column in self.columns.items():
+                grown = np.zeros(size, dtype=column.dtype)
+                grown[:i] = column
+                self.columns[name] = grown
+        self.columns["ts"][i] = ts
+        for name, _, _ in SERIES_FIELDS:
+            value = values[name]
+            self.columns[name][i] = np.nan if value is None else value
+
+    def view(self, name):
+        return list(self.views[name])
+
     def get_latest(self):
-        return self.data[-1] if self.data else {}
-    
-    def get_all(self):
-        return self.data
+        return self.latest
+
+    def restore_latest(self, snapshot):
+        # Latest snapshot reloaded from disk keeps its version numbering
+        self.version = max(self.version, snapshot.get("version", 0))
+        self.latest = snapshot
+        self.recent.append(snapshot)
+
+    def snapshot_at(self, version):
+        for snapshot in reversed(self.recent):
+            if snapshot["version"] == version:
+                return snapshot
+        return None
+
+    def wait_for_version(self, since, timeout):
+        # Park the caller until a version newer than `since` is saved
+        deadline = time.time() + timeout
+        with self.updated:
+            while self.version <= since:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.updated.wait(remaining)
+        return True
+
+    def cached_response(self, key):
+        if self.response_cache_version != self.version:
+            self.response_cache = {}
+            self.response_cache_version = self.version
+        return self.response_cache.get(key)
+
+    def cache_response(self, key, version, body):
+        if version == self.version == self.response_cache_version:
+            self.response_cache[key] = body
+
+    def window(self, n=None):
+        # Views over the newest n samples, oldest first
+        size = len(self)
+        n = size if n is None else max(0, min(int(n), size))
+        if self.count <= self.capacity:
+            end = self.count
+        else:
+            end = (self.count - 1) % self.capacity + self.capacity + 1
+        return {name: column[end - n:end] for name, column in self.columns.items()}
+
+    def between(self, start_ts=None, end_ts=None):
+        # Views over the samples with start_ts <= ts <= end_ts
+        view = self.window()
+        ts = view["ts"]
+        lo = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, side="left"))
+        hi = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, side="right"))
+        return {name: column[lo:hi] for name, column in view.items()}
+
+    def lists(self, view):
+        return {name: column_list(column) for name, column in view.items()}
+
+    def rows(self, n=None):
+        return series_rows(self.lists(self.window(n)))
+
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+# =============================================
+# DURABLE HISTORY (SQLite in WAL mode)
+# =============================================
+HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH", "history.db")
+HISTORY_FLUSH_INTERVAL = float(os.environ.get("HISTORY_FLUSH_INTERVAL", 2))
+HISTORY_QUERY_LIMIT = int(os.environ.get("HISTORY_QUERY_LIMIT", 100000))
+
+SERIES_COLUMNS = [name for name, _, _ in SERIES_FIELDS]
+
+# Snapshot numbers can be Decimal (streamed JSON) or NumPy scalars
+sqlite3.register_adapter(decimal.Decimal, float)
+for numpy_type in (np.int32, np.int64, np.float32):
+    sqlite3.register_adapter(numpy_type, numpy_type.item)
+
+class HistoryDB:
+    def __init__(self, path, read_only=False):
+        self.path = path
+        # Web workers only read; the ingest process owns every write
+        self.read_only = read_only
+        self.queue = real_queue.Queue()
+        self.lock = real_threading.Lock()
+        self.writer = None
+        self.written = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # Web workers leave the journal mode and schema to ingest and read
+        # missing tables and columns as empty until ingest has created them
+        self.present = {row[1] for row in self.conn.execute("PRAGMA table_info(samples)")}
+        if read_only:
+            return
+        columns = ", ".join(f"{name} REAL" for name in SERIES_COLUMNS)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            # (pair, ts) primary key on a WITHOUT ROWID table is the time index
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS samples (pair TEXT NOT NULL, ts REAL NOT NULL, {columns}, "
+                "PRIMARY KEY (pair, ts)) WITHOUT ROWID"
+            )
+            # Columns added to SERIES_FIELDS since the file was created
+            self.present = {row[1] for row in self.conn.execute("PRAGMA table_info(samples)")}
+            for name in SERIES_COLUMNS:
+                if name not in self.present:
+                    self.conn.execute(f"ALTER TABLE samples ADD COLUMN {name} REAL")
+                    self.present.add(name)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS latest (pair TEXT PRIMARY KEY, snapshot TEXT)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pairs (pair TEXT PRIMARY KEY, community_id TEXT, fetch_interval REAL)"
+            )
+
+    def start(self):
+        if self.writer is None and not self.read_only:
+            self.writer = real_threading.Thread(target=self._writer_loop, daemon=True)
+            self.writer.start()
+            storage_log.info(f"💽 History writer started on {self.path}")
+
+    def enqueue(self, pair_address, snapshot):
+        # Called on the tick path: only hands the snapshot to the writer thread
+        if self.read_only:
+            return
+        self.start()
+        self.queue.put_nowait((pair_address, snapshot, None))
+
+    def enqueue_point(self, pair_address, ts, values):
+        # Carried-forward sample: a samples row only, the latest snapshot stays
+        if self.read_only:
+            return
+        self.start()
+        self.queue.put_nowait((pair_address, None, (ts, values)))
+
+    def _writer_loop(self):
+        while True:
+            batch = [self.queue.get()]
+            real_time.sleep(HISTORY_FLUSH_INTERVAL)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except real_queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                storage_log.error(f"❌ Error writing history batch: {e}")
+
+    def _write(self, batch):
+        samples = []
+        latest = {}
+        for pair_address, snapshot, point in batch:
+            if point is None:
+                values = series_values(snapshot)
+                ts = datetime.fromisoformat(snapshot["timestamp"]).timestamp()
+                latest[pair_address] = snapshot
+            else:
+                ts, values = point
+            samples.append((pair_address, ts, *[values[name] for name in SERIES_COLUMNS]))
+        placeholders = ", ".join("?" for _ in range(len(SERIES_COLUMNS) + 2))
+        with self.lock, self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO samples VALUES ({placeholders})", samples)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO latest VALUES (?, ?)",
+                [(pair_address, dumps_bytes(snapshot).decode("utf-8")) for pair_address, snapshot in latest.items()],
+            )
+        self.written += len(samples)
+
+    def _execute(self, sql, params=()):
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params).fetchall()
 
-# Initialize storage
-data_storage = SimpleStorage()
+    def execute(self, sql, params=()):
+        return tpool.execute(self._execute, sql, params)
+
+    def select_columns(self):
+        if not self.present.issuperset(SERIES_COLUMNS):
+            self.present = {row[1] for row in self.execute("PRAGMA table_info(samples)")}
+        return ", ".join(name if name in self.present else f"NULL AS {name}" for name in SERIES_COLUMNS)
+
+    def query(self, pair_address, start=None, end=None, limit=HISTORY_QUERY_LIMIT, newest=False, before=None):
+        # Column lists for pair samples with start <= ts <= end and ts < before,
+        # oldest first; newest=True keeps the newest `limit` of them
+        selected = self.select_columns()
+        if "ts" not in self.present:
+            return {name: [] for name in ["ts", *SERIES_COLUMNS]}
+        rows = self.execute(
+            f"SELECT ts, {selected} FROM samples "
+            f"WHERE pair = ? AND ts >= ? AND ts <= ? AND ts < ? ORDER BY ts {'DESC' if newest else 'ASC'} LIMIT ?",
+            (
+                pair_address,
+                start if start is not None else float("-inf"),
+                end if end is not None else float("inf"),
+                before if before is not None else float("inf"),
+                limit,
+            ),
+        )
+        if newest:
+            rows.reverse()
+        columns = list(zip(*rows)) if rows else [[] for _ in range(len(SERIES_COLUMNS) + 1)]
+        lists = {"ts": list(columns[0])}
+        for index, (name, _, dtype) in enumerate(SERIES_FIELDS, start=1):
+            if dtype is np.float64:
+                lists[name] = list(columns[index])
+            else:
+                lists[name] = [0 if v is None else int(v) for v in columns[index]]
+        return lists
+
+    def latest_snapshot(self, pair_address):
+        rows = self.execute("SELECT snapshot FROM latest WHERE pair = ?", (pair_address,))
+        return loads_json(rows[0][0]) if rows else None
+
+    def save_pair(self, pair):
+        if self.read_only:
+            return
+        self.execute(
+            "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?)",
+            (pair.pair_address, pair.community_id, pair.fetch_interval),
+        )
+
+    def remove_pair(self, pair_address):
+        if self.read_only:
+            return
+        self.execute("DELETE FROM pairs WHERE pair = ?", (pair_address,))
+
+    def saved_pairs(self):
+        return self.execute("SELECT pair, community_id, fetch_interval FROM pairs")
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "written": self.written,
+            "pending": self.queue.qsize(),
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+history_db = HistoryDB(HISTORY_DB_PATH, read_only=BX_ROLE == "web") if HISTORY_DB_PATH else None
 
 # Global variables
-PAIR_ADDRESS = None
-community_id = None
-fetch_interval = 3  # seconds
+fetch_interval = 3  # default seconds between fetches for a pair
+MIN_FETCH_INTERVAL = 1
+MAX_CONCURRENT_PAIR_FETCHES = int(os.environ.get("MAX_CONCURRENT_PAIR_FETCHES", 10))
 is_fetching = False
 
-# Axiom API endpoints (will be updated with PAIR_ADDRESS)
-axiom_endpoints = {}
+# Upstream calls of a tick run concurrently and are cut off at TICK_DEADLINE
+TICK_DEADLINE = float(os.environ.get("TICK_DEADLINE", 5))
+UPSTREAM_CONCURRENCY = int(os.environ.get("UPSTREAM_CONCURRENCY", 100))
+upstream_pool = eventlet.GreenPool(UPSTREAM_CONCURRENCY)
+
+# Value used for a source that has never answered; after that a failed
+# source carries its last good value forward and is listed as stale
+SOURCE_FALLBACKS = {
+    "timeline": {"tweets": [], "cursor": None},
+    "pair_stats": [],
+}
 
 # Axiom API config
 axiom_headers = {
@@ -141,10 +988,16 @@ x_headers = {
     "x-xp-forwarded-for": "1dff0f5c36061e940f483d608f30ff9548e825fa4494fbea542c194f5a4c33c2926652e15f5439719439b2b8aa7a2aff4c8b5bfa1e0bceb490ae5424c8cf7a3ed3f4efa23a1a5b84c8e39794c85907399b423d72351a550563a62a48ac96d501dc75e06cf2fac269615dc7488ab161c4cc0967e868fd6d492e833b762757d680de466f9e46ec09cd90c0d5e7edb01d42b55ec2c5c9c3ae2c1708435e24735ae02665d83e35111ac4d4daa68fbbafa937414c4913ee575939a4dea4798d9d570c71800ec4d0b60e32ed8eeb4ff717395476c8f22d224f0284c86115a981a6fa061ba561dc9741fc3dd07152bf7458ccabe504b5dc56db63a38b9d58"
 }
 
-# X endpoints (will be updated with community_id)
-x_urls = {}
+# Upstream base URLs; overridden to point at a local stand-in (see bench/)
+AXIOM_API_URLS = {
+    "api6": os.environ.get("AXIOM_API6_URL", "https://api6.axiom.trade"),
+    "api9": os.environ.get("AXIOM_API9_URL", "https://api9.axiom.trade"),
+    "api10": os.environ.get("AXIOM_API10_URL", "https://api10.axiom.trade"),
+}
+X_BASE_URL = os.environ.get("X_BASE_URL", "https://x.com")
+COINGECKO_BASE_URL = os.environ.get("COINGECKO_BASE_URL", "https://api.coingecko.com")
 
-COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
+COINGECKO_URL = f"{COINGECKO_BASE_URL}/api/v3/simple/price?ids=solana&vs_currencies=usd"
 PRICE_UPDATE_INTERVAL = 600
 
 # Global cache for SOL price
@@ -153,302 +1006,2532 @@ cached_sol_price = {
     "last_updated": 0
 }
 
+# =============================================
+# STREAMING EXTREMA
+# =============================================
+# Fib retracement windows in seconds; None means since tracking started
+FIB_WINDOWS = {}
+for spec in os.environ.get("FIB_WINDOWS", "5m:300,1h:3600,all").split(","):
+    label, _, seconds = spec.strip().partition(":")
+    FIB_WINDOWS[label] = float(seconds) if seconds else None
+
+FIB_RATIOS = {"fib23": 0.236, "fib38": 0.382, "fib50": 0.50, "fib62": 0.62, "fib78": 0.786}
+FIB_FLOOR_MC = 5750
+
+class ExtremaTracker:
+    # Running min/max per window. Sliding windows use monotonic deques of
+    # (ts, value), so each sample costs amortized O(1) and nothing rescans
+    # the stored history.
+    def __init__(self, windows=FIB_WINDOWS):
+        self.windows = dict(windows)
+        self.count = 0
+        self.lows = {label: deque() for label in self.windows}
+        self.highs = {label: deque() for label in self.windows}
+        self.all_low = None
+        self.all_high = None
+
+    def update(self, ts, value):
+        if value is None or value != value:
+            return
+        self.count += 1
+        if self.all_low is None or value < self.all_low:
+            self.all_low = value
+        if self.all_high is None or value > self.all_high:
+            self.all_high = value
+
+        for label, span in self.windows.items():
+            if span is None:
+                continue
+            lows, highs = self.lows[label], self.highs[label]
+            while lows and lows[-1][1] >= value:
+                lows.pop()
+            lows.append((ts, value))
+            while highs and highs[-1][1] <= value:
+                highs.pop()
+            highs.append((ts, value))
+            self._expire(label, ts)
+
+    def _expire(self, label, now):
+        cutoff = now - self.windows[label]
+        for queue in (self.lows[label], self.highs[label]):
+            while len(queue) > 1 and queue[0][0] < cutoff:
+                queue.popleft()
+
+    def extremes(self, label, now=None):
+        if self.windows.get(label) is None:
+            return self.all_low, self.all_high
+        if now is not None:
+            self._expire(label, now)
+        lows, highs = self.lows[label], self.highs[label]
+        if not lows:
+            return None, None
+        return lows[0][1], highs[0][1]
+
+    def fib_levels(self, now=None):
+        levels = {}
+        for label, span in self.windows.items():
+            low, high = self.extremes(label, now)
+            if low is None:
+                levels[label] = None
+                continue
+            levels[label] = {"window": span, "low": low, "high": high}
+            for key, ratio in FIB_RATIOS.items():
+                levels[label][key] = low + ratio * (high - low)
+        return levels
+
+# =============================================
+# STREAMING INDICATORS
+# =============================================
+class IndicatorEngine:
+    # Rolling indicators advanced once per sample in amortized O(1): time-
+    # weighted EMAs and running-sum SMAs of market cap, and per window the
+    # buy/sell flow (running sums of volume deltas) plus holder, views and
+    # engagement rates per minute, measured from the newest sample that has
+    # left the window.
+    def __init__(self):
+        self.last_ts = None
+        self.last_volumes = None
+        self.ema = dict.fromkeys(INDICATOR_EMA)
+        self.ema_ts = None
+        self.sma = {label: deque() for label in INDICATOR_SMA}
+        self.sma_sums = dict.fromkeys(INDICATOR_SMA, 0.0)
+        self.samples = {label: deque() for label in INDICATOR_WINDOWS}
+        self.anchors = dict.fromkeys(INDICATOR_WINDOWS)
+        self.flows = {label: [0.0, 0.0] for label in INDICATOR_WINDOWS}
+        self.latest = dict.fromkeys(INDICATOR_FIELDS)
+
+    def update(self, ts, values):
+        if self.last_ts is not None and ts <= self.last_ts:
+            return self.latest
+        indicators = {}
+        market_cap = values.get("marketCapUSD")
+        if market_cap is not None and market_cap == market_cap:
+            self._update_averages(ts, market_cap)
+        for label in INDICATOR_EMA:
+            indicators[f"mcEma{label}"] = self.ema[label]
+        for label, queue in self.sma.items():
+            indicators[f"mcSma{label}"] = self.sma_sums[label] / len(queue) if queue else None
+
+        # pair-stats volumes are running totals; a drop (upstream reset)
+        # counts as no flow rather than negative flow
+        volumes = (values.get("buyVolumeSol") or 0, values.get("sellVolumeSol") or 0)
+        if self.last_volumes is None:
+            bought = sold = 0.0
+        else:
+            bought = max(0.0, volumes[0] - self.last_volumes[0])
+            sold = max(0.0, volumes[1] - self.last_volumes[1])
+        self.last_volumes = volumes
+        engagement = (values.get("likes") or 0) + (values.get("retweets") or 0) + (values.get("replies") or 0)
+        sample = (ts, bought, sold, values.get("numHolders") or 0, values.get("views") or 0, engagement)
+        for label, span in INDICATOR_WINDOWS.items():
+            indicators.update(self._update_window(label, span, sample))
+
+        self.last_ts = ts
+        self.latest = indicators
+        return indicators
+
+    def _update_averages(self, ts, value):
+        for label, tau in INDICATOR_EMA.items():
+            previous = self.ema[label]
+            if previous is None:
+                self.ema[label] = value
+            else:
+                # Irregular sampling: the weight depends on the time since the last sample
+                alpha = 1 - math.exp(-(ts - self.ema_ts) / tau)
+                self.ema[label] = previous + alpha * (value - previous)
+        self.ema_ts = ts
+        for label, span in INDICATOR_SMA.items():
+            queue = self.sma[label]
+            queue.append((ts, value))
+            self.sma_sums[label] += value
+            while queue[0][0] <= ts - span:
+                self.sma_sums[label] -= queue.popleft()[1]
+
+    def _update_window(self, label, span, sample):
+        ts = sample[0]
+        queue, flow = self.samples[label], self.flows[label]
+        queue.append(sample)
+        flow[0] += sample[1]
+        flow[1] += sample[2]
+        while queue[0][0] <= ts - span:
+            expired = self.anchors[label] = queue.popleft()
+            flow[0] -= expired[1]
+            flow[1] -= expired[2]
+        bought, sold = max(0.0, flow[0]), max(0.0, flow[1])
+        reference = self.anchors[label] or queue[0]
+        elapsed = ts - reference[0]
+
+        def per_minute(index):
+            return (sample[index] - reference[index]) / elapsed * 60 if elapsed > 0 else None
+
+        return {
+            f"buyPressure{label}": bought / (bought + sold) if bought + sold > 0 else None,
+            f"buySellRatio{label}": bought / sold if sold > 0 else None,
+            f"holderGrowth{label}": per_minute(3),
+            f"viewsVelocity{label}": per_minute(4),
+            f"engagementVelocity{label}": per_minute(5),
+        }
+
+# =============================================
+# WALLET INDEX
+# =============================================
+DAY_SECONDS = 86400
+# Age buckets as (name, max age in whole days), youngest first
+WALLET_AGE_BUCKETS = [("baby", 30), ("adult", 180), ("old", None)]
+WALLET_BUCKET_NAMES = [name for name, _ in WALLET_AGE_BUCKETS] + ["unknown"]
+UNKNOWN_BUCKET = len(WALLET_AGE_BUCKETS)
+# Age in days at which a wallet leaves each bounded bucket
+WALLET_AGE_EDGES = np.array([max_days + 1 for _, max_days in WALLET_AGE_BUCKETS if max_days is not None], dtype=np.float64)
+WALLET_AGE_PERCENTILES = (10, 25, 50, 75, 90)
+WALLET_AGE_HISTOGRAM_DAYS = [0, 1, 7, 30, 90, 180, 365, 730, np.inf]
+# Holder fields that may carry the wallet's token balance, first match wins
+HOLDER_BALANCE_KEYS = ("tokenBalance", "balance", "amount", "uiAmount")
+
+def parse_funded_at(funded_at):
+    if not funded_at:
+        return None
+    try:
+        return datetime.fromisoformat(funded_at.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def parse_funded_batch(values):
+    # Epoch seconds per fundedAt, NaN where missing or unparseable. UTC
+    # strings ending in Z go through datetime64 in one call; anything else
+    # (offsets, naive local times) takes the per-value parser.
+    utc = [v[:-1] if isinstance(v, str) and v.endswith("Z") else "NaT" for v in values]
+    try:
+        stamps = np.array(utc, dtype="datetime64[us]")
+        out = np.where(np.isnat(stamps), np.nan, stamps.astype(np.int64) / 1e6)
+        rest = [i for i, v in enumerate(values) if v and utc[i] == "NaT"]
+    except ValueError:
+        out = np.full(len(values), np.nan)
+        rest = [i for i, v in enumerate(values) if v]
+    for i in rest:
+        ts = parse_funded_at(values[i])
+        if ts is not None:
+            out[i] = ts
+    return out
+
+def classify_wallet_ages(funded_ts, now):
+    # Bucket index per wallet and the time it moves to the next bucket
+    # (inf once old, NaN if unknown)
+    age_days = np.floor((now - funded_ts) / DAY_SECONDS)
+    known = ~np.isnan(funded_ts)
+    buckets = np.where(known, np.searchsorted(WALLET_AGE_EDGES, age_days, side="right"), UNKNOWN_BUCKET)
+    edges = np.append(WALLET_AGE_EDGES, np.inf)[np.minimum(buckets, len(WALLET_AGE_EDGES))]
+    return buckets.astype(np.int8), funded_ts + edges * DAY_SECONDS
+
+def holder_balance(h):
+    for key in HOLDER_BALANCE_KEYS:
+        value = h.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return np.nan
+
+def wallet_age_stats(funded_ts, buckets, balances, now):
+    # Percentiles and histogram of wallet age plus share of supply per bucket
+    known = ~np.isnan(funded_ts)
+    ages = np.maximum((now - funded_ts[known]) / DAY_SECONDS, 0)
+    counts, _ = np.histogram(ages, bins=WALLET_AGE_HISTOGRAM_DAYS)
+    stats = {
+        "wallets": int(len(funded_ts)),
+        "knownAge": int(known.sum()),
+        "percentilesDays": None,
+        "meanDays": round(float(ages.mean()), 2) if ages.size else None,
+        "histogram": [
+            {"minDays": lo, "maxDays": None if hi == np.inf else hi, "count": int(count)}
+            for lo, hi, count in zip(WALLET_AGE_HISTOGRAM_DAYS, WALLET_AGE_HISTOGRAM_DAYS[1:], counts)
+        ],
+        "supplyShare": None,
+    }
+    if ages.size:
+        values = np.percentile(ages, WALLET_AGE_PERCENTILES)
+        stats["percentilesDays"] = {f"p{p}": round(float(v), 2) for p, v in zip(WALLET_AGE_PERCENTILES, values)}
+
+    held = ~np.isnan(balances)
+    if held.any():
+        totals = np.bincount(buckets[held], weights=balances[held], minlength=len(WALLET_BUCKET_NAMES))
+        total = totals.sum()
+        stats["supplyShare"] = {
+            name: round(float(totals[i] / total * 100), 2) if total else 0
+            for i, name in enumerate(WALLET_BUCKET_NAMES)
+        }
+    return stats
+
+class WalletIndex:
+    # Holders of one pair across ticks. Each wallet owns a slot in parallel
+    # NumPy arrays: fundedAt is parsed once when it joins, only joins and
+    # leaves touch the bucket counts, and bucket transitions are found by
+    # popping a heap of due times instead of rescanning every wallet.
+    def __init__(self, capacity=256):
+        self.slots = {}
+        self.free = list(range(capacity - 1, -1, -1))
+        self.info = [None] * capacity
+        self.funded = np.full(capacity, np.nan)
+        self.balance = np.full(capacity, np.nan)
+        self.bucket = np.full(capacity, -1, dtype=np.int8)
+        self.due_at = np.full(capacity, np.nan)
+        self.due = []
+        self.counts = np.zeros(len(WALLET_BUCKET_NAMES), dtype=np.int64)
+        self.holders = []
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _grow(self):
+        size = len(self.info)
+        self.info += [None] * size
+        self.funded = np.append(self.funded, np.full(size, np.nan))
+        self.balance = np.append(self.balance, np.full(size, np.nan))
+        self.bucket = np.append(self.bucket, np.full(size, -1, dtype=np.int8))
+        self.due_at = np.append(self.due_at, np.full(size, np.nan))
+        self.free.extend(range(2 * size - 1, size - 1, -1))
+
+    def _slot(self):
+        if not self.free:
+            self._grow()
+        return self.free.pop()
+
+    def _remove(self, wallet):
+        slot = self.slots.pop(wallet)
+        self.counts[self.bucket[slot]] -= 1
+        self.bucket[slot] = -1
+        self.info[slot] = None
+        self.free.append(slot)
+
+    def _add(self, joined, now):
+        funded_ts = parse_funded_batch([funded_at for _, funded_at, _ in joined])
+        buckets, due_at = classify_wallet_ages(funded_ts, now)
+        for (wallet, funded_at, balance), ts, bucket, due in zip(joined, funded_ts, buckets, due_at):
+            slot = self._slot()
+            self.slots[wallet] = slot
+            self.funded[slot] = ts
+            self.balance[slot] = balance
+            self.bucket[slot] = bucket
+            self.due_at[slot] = due
+            self.info[slot] = {
+                "walletAddress": wallet,
+                "fundedAt": funded_at,
+                "ageCategory": WALLET_BUCKET_NAMES[bucket],
+            }
+            if due < np.inf:
+                heapq.heappush(self.due, (float(due), wallet))
+        self.counts += np.bincount(buckets, minlength=len(WALLET_BUCKET_NAMES))
+
+    def _advance(self, now):
+        moved = []
+        while self.due and self.due[0][0] <= now:
+            due, wallet = heapq.heappop(self.due)
+            slot = self.slots.get(wallet)
+            if slot is not None and self.due_at[slot] == due:
+                moved.append(slot)
+        if not moved:
+            return False
+        moved = np.array(moved)
+        self.counts -= np.bincount(self.bucket[moved], minlength=len(WALLET_BUCKET_NAMES))
+        buckets, due_at = classify_wallet_ages(self.funded[moved], now)
+        self.bucket[moved] = buckets
+        self.due_at[moved] = due_at
+        self.counts += np.bincount(buckets, minlength=len(WALLET_BUCKET_NAMES))
+        for slot, bucket, due in zip(moved, buckets, due_at):
+            # Snapshots hold the old dict, so replace rather than mutate
+            info = dict(self.info[slot], ageCategory=WALLET_BUCKET_NAMES[bucket])
+            self.info[slot] = info
+            if due < np.inf:
+                heapq.heappush(self.due, (float(due), info["walletAddress"]))
+        return True
+
+    def update(self, holder_json, now=None):
+        now = time.time() if now is None else now
+        current = {}
+        for h in holder_json:
+            if not h or not isinstance(h, dict):
+                continue
+            wallet = h.get("walletAddress")
+            if not wallet or wallet in current:
+                continue
+            wf = h.get("walletFunding")
+            current[wallet] = (wf.get("fundedAt") if isinstance(wf, dict) else None, holder_balance(h))
+
+        left = [wallet for wallet in self.slots if wallet not in current]
+        for wallet in left:
+            self._remove(wallet)
+        joined = []
+        for wallet, (funded_at, balance) in current.items():
+            slot = self.slots.get(wallet)
+            if slot is not None and self.info[slot]["fundedAt"] == funded_at:
+                self.balance[slot] = balance
+                continue
+            if slot is not None:
+                self._remove(wallet)
+            joined.append((wallet, funded_at, balance))
+        if joined:
+            self._add(joined, now)
+        self._advance(now)
+
+        # Heap entries of departed wallets are skipped lazily; rebuild once
+        # they dominate so the heap stays proportional to the holder set
+        if len(self.due) > 2 * len(self.slots) + 64:
+            self.due = [(float(self.due_at[slot]), wallet) for wallet, slot in self.slots.items() if self.due_at[slot] < np.inf]
+            heapq.heapify(self.due)
+
+        self.holders = [self.info[self.slots[wallet]] for wallet in current]
+        return len(joined), len(left)
+
+    def advance(self, now=None):
+        # Bucket transitions only, for ticks where the holder list is unchanged
+        if self._advance(time.time() if now is None else now):
+            self.holders = [self.info[self.slots[h["walletAddress"]]] for h in self.holders]
+            return True
+        return False
+
+    def age_counts(self):
+        return {name: int(self.counts[i]) for i, (name, _) in enumerate(WALLET_AGE_BUCKETS)}
+
+    def stats(self, now=None):
+        now = time.time() if now is None else now
+        live = self.bucket >= 0
+        return wallet_age_stats(self.funded[live], self.bucket[live].astype(np.intp), self.balance[live], now)
+
+# =============================================
+# TWEET STORE
+# =============================================
+TWEET_STORE_LIMIT = int(os.environ.get("TWEET_STORE_LIMIT", 2000))
+TWEET_SERIES_POINTS = int(os.environ.get("TWEET_SERIES_POINTS", 240))
+TWEET_BACKFILL_PAGES = int(os.environ.get("TWEET_BACKFILL_PAGES", 10))
+TWEET_BACKFILL_DELAY = float(os.environ.get("TWEET_BACKFILL_DELAY", 5))
+# Engagement counters tracked per tweet, in series order
+TWEET_COUNTERS = ("views", "likes", "retweets", "replies")
+
+def tweet_counters(tweet):
+    return (
+        int(tweet.get("views") or 0),
+        tweet.get("favorite_count") or 0,
+        tweet.get("retweet_count") or 0,
+        tweet.get("reply_count") or 0,
+    )
+
+class TweetStore:
+    # Community tweets of one pair keyed by tweet_id. Pages are upserted so
+    # unchanged tweets cost a tuple compare, totals and authors are kept
+    # incrementally and every counter change lands in the tweet's series.
+    # With journal=True the changes are also kept for drain(), so web
+    # workers can replay them.
+    def __init__(self, limit=TWEET_STORE_LIMIT, journal=False):
+        self.limit = limit
+        self.tweets = {}
+        self.counters = {}
+        self.series = {}
+        self.totals = [0] * len(TWEET_COUNTERS)
+        self.authors = {}
+        self.author_tweets = {}
+        self.head = []
+        self.cursor = None
+        self.backfilling = False
+        self.backfilled_pages = 0
+        self.journal = [] if journal else None
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tweets)
+
+    def upsert(self, tweets, now=None):
+        now = time.time() if now is None else now
+        added = updated = 0
+        with self.lock:
+            for tweet in tweets:
+                tweet_id = tweet.get("tweet_id")
+                if not tweet_id:
+                    continue
+                counters = tweet_counters(tweet)
+                old = self.counters.get(tweet_id)
+                if old == counters:
+                    continue
+                if old is None:
+                    added += 1
+                    self._add_author(tweet)
+                else:
+                    updated += 1
+                    self.totals = [t - o for t, o in zip(self.totals, old)]
+                self.totals = [t + c for t, c in zip(self.totals, counters)]
+                self.tweets[tweet_id] = tweet
+                self.counters[tweet_id] = counters
+                if tweet_id not in self.series:
+                    self.series[tweet_id] = deque(maxlen=TWEET_SERIES_POINTS)
+                self.series[tweet_id].append((now,) + counters)
+                if self.journal is not None:
+                    self.journal.append((now, tweet))
+            if len(self.tweets) > self.limit:
+                self._evict(len(self.tweets) - self.limit)
+        return added, updated
+
+    def ingest_head(self, page, now=None):
+        # Newest timeline page: upsert it and seed the backfill cursor once
+        added, updated = self.upsert(page.get("tweets", []), now)
+        self.head = [t["tweet_id"] for t in page.get("tweets", []) if t.get("tweet_id") in self.tweets]
+        if self.cursor is None and not self.backfilled_pages:
+            self.cursor = page.get("cursor")
+        return added, updated
+
+    def wants_backfill(self):
+        return bool(self.cursor) and not self.backfilling and self.backfilled_pages < TWEET_BACKFILL_PAGES
+
+    def _add_author(self, tweet):
+        author = tweet.get("author_screen")
+        if not author:
+            return
+        self.author_tweets[author] = self.author_tweets.get(author, 0) + 1
+        self.authors[author] = {
+            "author": author,
+            "followers": tweet.get("followers_count", 0),
+            "author_name": tweet.get("author_name", ""),
+        }
+
+    def _evict(self, count):
+        # Tweet ids are snowflakes, so the smallest ids are the oldest tweets
+        for tweet_id in sorted(self.tweets, key=int)[:count]:
+            tweet = self.tweets.pop(tweet_id)
+            self.totals = [t - c for t, c in zip(self.totals, self.counters.pop(tweet_id))]
+            self.series.pop(tweet_id, None)
+            author = tweet.get("author_screen")
+            if author in self.author_tweets:
+                self.author_tweets[author] -= 1
+                if not self.author_tweets[author]:
+                    del self.author_tweets[author]
+                    del self.authors[author]
+
+    def head_tweets(self):
+        return [self.tweets[tweet_id] for tweet_id in self.head if tweet_id in self.tweets]
+
+    def author_followers(self):
+        return list(self.authors.values())
+
+    def social_totals(self):
+        return dict(zip(TWEET_COUNTERS, self.totals))
+
+    def newest(self, limit):
+        ids = sorted(self.tweets, key=int, reverse=True)[:limit]
+        return [self.tweets[tweet_id] for tweet_id in ids]
+
+    def tweet_series(self, tweet_id):
+        points = list(self.series.get(tweet_id, ()))
+        series = {"ts": [p[0] for p in points]}
+        for i, name in enumerate(TWEET_COUNTERS, start=1):
+            series[name] = [p[i] for p in points]
+        return series
+
+    def drain(self):
+        # Changes since the last drain plus the cursor state
+        with self.lock:
+            changes = self.journal or []
+            if self.journal is not None:
+                self.journal = []
+        return {**self._state(), "changes": changes}
+
+    def export(self):
+        # The whole store, for a web worker that has just subscribed
+        with self.lock:
+            return {
+                **self._state(),
+                "tweets": list(self.tweets.values()),
+                "series": {tweet_id: list(points) for tweet_id, points in self.series.items()},
+                "changes": [],
+            }
+
+    def _state(self):
+        return {
+            "head": list(self.head),
+            "cursor": self.cursor,
+            "backfilling": self.backfilling,
+            "backfilledPages": self.backfilled_pages,
+        }
+
+    def apply(self, state):
+        # Mirror an export() or drain() taken in the ingest process
+        if "tweets" in state:
+            self._load(state["tweets"], state["series"])
+        for now, tweet in state["changes"]:
+            self.upsert([tweet], now)
+        self.head = state["head"]
+        self.cursor = state["cursor"]
+        self.backfilling = state["backfilling"]
+        self.backfilled_pages = state["backfilledPages"]
+
+    def _load(self, tweets, series):
+        with self.lock:
+            self.tweets = {}
+            self.counters = {}
+            self.series = {}
+            self.totals = [0] * len(TWEET_COUNTERS)
+            self.authors = {}
+            self.author_tweets = {}
+            for tweet in tweets:
+                tweet_id = tweet["tweet_id"]
+                counters = tweet_counters(tweet)
+                self._add_author(tweet)
+                self.totals = [t + c for t, c in zip(self.totals, counters)]
+                self.tweets[tweet_id] = tweet
+                self.counters[tweet_id] = counters
+                points = series.get(tweet_id, ())
+                self.series[tweet_id] = deque((tuple(p) for p in points), maxlen=TWEET_SERIES_POINTS)
+
+    def stats(self):
+        return {
+            "tweets": len(self.tweets),
+            "authors": len(self.authors),
+            "backfilledPages": self.backfilled_pages,
+            "backfilling": self.backfilling,
+            "cursor": bool(self.cursor),
+        }
+
+# =============================================
+# UPSTREAM HTTP CLIENTS
+# =============================================
+UPSTREAM_POOL_SIZE = int(os.environ.get("UPSTREAM_POOL_SIZE", 20))
+UPSTREAM_HTTP2 = os.environ.get("UPSTREAM_HTTP2", "0") == "1"
+DNS_CACHE_TTL = float(os.environ.get("DNS_CACHE_TTL", 300))
+
+# Per-host circuit breaker: after BREAKER_FAILURES consecutive failures a
+# host is skipped for a jittered, exponentially growing cooldown (or its
+# Retry-After, if longer), then a single probe decides whether it closes
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", 3))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", 5))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("BREAKER_MAX_COOLDOWN", 300))
+UPSTREAM_TIMEOUT = float(os.environ.get("UPSTREAM_TIMEOUT", 15))
+
+# Idempotent Axiom reads can be answered by any of its API hosts: a second
+# request goes to an alternate when the first is slower than HEDGE_DELAY
+UPSTREAM_HEDGE = os.environ.get("UPSTREAM_HEDGE", "1") == "1"
+HEDGE_DELAY = float(os.environ.get("HEDGE_DELAY", 1.0))
+AXIOM_API_HOSTS = [urlsplit(url).netloc for url in AXIOM_API_URLS.values()]
+
+# Statuses that mean the host itself is struggling, not the request
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Raised into a request when the tick deadline or a won hedge cuts it off
+CANCELLED = (greenlet.GreenletExit, eventlet.Timeout)
+
+# Conditional-request headers only mean something to the host that issued
+# the validators, so hedged attempts to other hosts go without them
+VALIDATOR_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+class CircuitOpen(Exception):
+    pass
+
+def parse_retry_after(value):
+    # Retry-After is either delay seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    def __init__(self, host):
+        self.host = host
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0
+        self.probing = False
+        self.rejected = 0
+
+    @property
+    def state(self):
+        if self.failures < BREAKER_FAILURES:
+            return "closed"
+        return "open" if time.time() < self.open_until else "half_open"
+
+    def allow(self):
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def available(self):
+        return self.state == "closed" or (self.state == "half_open" and not self.probing)
+
+    def success(self):
+        if self.failures >= BREAKER_FAILURES:
+            upstream_log.info(f"✅ Circuit closed for {self.host}")
+        self.failures = 0
+        self.trips = 0
+        self.probing = False
+
+    def cancel(self):
+        # The request was cut off by the caller, not answered by the host
+        self.probing = False
+
+    def failure(self, retry_after=None):
+        self.failures += 1
+        self.probing = False
+        if self.failures < BREAKER_FAILURES and retry_after is None:
+            return
+        # Full jitter keeps pairs sharing a host from probing in lockstep
+        self.failures = max(self.failures, BREAKER_FAILURES)
+        self.trips += 1
+        cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * 2 ** (self.trips - 1))
+        cooldown = random.uniform(cooldown / 2, cooldown)
+        if retry_after is not None:
+            cooldown = max(cooldown, min(retry_after, BREAKER_MAX_COOLDOWN))
+        self.open_until = time.time() + cooldown
+        upstream_log.warning(f"🚧 Circuit open for {self.host} for {cooldown:.1f}s")
+
+    def to_dict(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retryIn": round(max(0, self.open_until - time.time()), 1),
+        }
+
+# httpx only speaks HTTP/2 when h2 is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class DNSCache:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.hosts = set()
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._resolve = socket.getaddrinfo
+
+    def getaddrinfo(self, host, port, *args, **kwargs):
+        # Only upstream hosts are cached, everything else resolves as usual
+        if host not in self.hosts:
+            return self._resolve(host, port, *args, **kwargs)
+
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        addresses = self._resolve(host, port, *args, **kwargs)
+        self.entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+    def install(self):
+        socket.getaddrinfo = self.getaddrinfo
+
+    def stats(self):
+        return {"hosts": sorted(self.hosts), "entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+dns_cache = DNSCache(DNS_CACHE_TTL)
+dns_cache.install()
+
+class UpstreamClient:
+    def __init__(self, host, headers=None, cookies=None, http2=False):
+        self.host = host
+        self.http2 = http2
+        self.requests = 0
+        self.errors = 0
+        self.pool_misses = 0
+        self.breaker = CircuitBreaker(host)
+
+        if http2:
+            self.session = httpx.Client(
+                http2=True,
+                headers=headers,
+                cookies=cookies,
+                limits=httpx.Limits(max_connections=UPSTREAM_POOL_SIZE, max_keepalive_connections=UPSTREAM_POOL_SIZE),
+            )
+        else:
+            self.session = requests.Session()
+            self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPSTREAM_POOL_SIZE)
+            self.session.mount("https://", self.adapter)
+            self.session.mount("http://", self.adapter)
+            if headers:
+                self.session.headers.update(headers)
+            if cookies:
+                self.session.cookies.update(cookies)
+
+    def _trace(self, event_name, info):
+        # httpcore reports every new TCP connection, i.e. a pool miss
+        if event_name == "connection.connect_tcp.started":
+            self.pool_misses += 1
+
+    def get(self, url, timeout=UPSTREAM_TIMEOUT, **kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpen(f"circuit open for {self.host}")
+        self.requests += 1
+        resp = None
+        cancelled = False
+        started = time.perf_counter()
+        try:
+            if self.http2:
+                # httpx bodies are read eagerly, stream only applies to requests
+                kwargs.pop("stream", None)
+                resp = self.session.get(url, timeout=timeout, extensions={"trace": self._trace}, **kwargs)
+            else:
+                resp = self.session.get(url, timeout=timeout, **kwargs)
+            return resp
+        except CANCELLED:
+            cancelled = True
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            # A call the tick deadline kills mid-request says nothing about
+            # the host, so it is timed but leaves the breaker alone
+            outcome = resp.status_code if resp is not None else ("cancelled" if cancelled else "error")
+            UPSTREAM_REQUEST_SECONDS.labels(self.host, outcome).observe(time.perf_counter() - started)
+            if cancelled:
+                self.breaker.cancel()
+            elif resp is None:
+                self.breaker.failure()
+            elif resp.status_code in RETRYABLE_STATUSES:
+                self.breaker.failure(parse_retry_after(resp.headers.get("Retry-After")))
+            else:
+                self.breaker.success()
+
+    def stats(self):
+        if self.http2:
+            misses = self.pool_misses
+        else:
+            # urllib3 counts every connection it had to open per pool
+            pools = self.adapter.poolmanager.pools
+            misses = sum(pools[key].num_connections for key in pools.keys())
+        return {
+            "host": self.host,
+            "http2": self.http2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "poolHits": max(0, self.requests - misses),
+            "poolMisses": misses,
+            "breaker": self.breaker.to_dict(),
+        }
+
+class UpstreamClients:
+    def __init__(self):
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def profile(self, host):
+        # Each upstream owns its header/cookie set
+        if host.endswith("axiom.trade"):
+            return axiom_headers, axiom_cookies
+        if host == "x.com" or host.endswith(".x.com"):
+            return x_headers, None
+        return None, None
+
+    def for_url(self, url):
+        # Keyed by host and port, so stand-ins on one host stay separate
+        parts = urlsplit(url)
+        client = self.clients.get(parts.netloc)
+        if client:
+            return client
+
+        with self.lock:
+            client = self.clients.get(parts.netloc)
+            if not client:
+                headers, cookies = self.profile(parts.hostname)
+                http2 = UPSTREAM_HTTP2 and HTTP2_AVAILABLE
+                client = UpstreamClient(parts.netloc, headers=headers, cookies=cookies, http2=http2)
+                self.clients[parts.netloc] = client
+                dns_cache.hosts.add(parts.hostname)
+                upstream_log.info(f"🔌 Opened {'HTTP/2' if http2 else 'keep-alive'} pool for {parts.netloc}")
+            return client
+
+    def get(self, url, hedge=False, **kwargs):
+        if upstream_replay:
+            return upstream_replay.get(url)
+        try:
+            if not (hedge and UPSTREAM_HEDGE):
+                resp = self.for_url(url).get(url, **kwargs)
+            else:
+                resp = self.hedged_get(self.candidates(url), **kwargs)
+        except Exception as e:
+            if upstream_recorder:
+                upstream_recorder.record_error(url, e)
+            raise
+        if upstream_recorder:
+            return upstream_recorder.record(resp)
+        return resp
+
+    def candidates(self, url):
+        # The URL itself, then the same path on every alternate host, minus
+        # hosts with an open circuit (the URL alone if every circuit is open)
+        parts = urlsplit(url)
+        if parts.netloc not in AXIOM_API_HOSTS:
+            return [url]
+        urls = [url] + [parts._replace(netloc=host).geturl() for host in AXIOM_API_HOSTS if host != parts.netloc]
+        return [u for u in urls if self.for_url(u).breaker.available()] or [url]
+
+    def available(self, url, hedge=False):
+        urls = self.candidates(url) if hedge and UPSTREAM_HEDGE else [url]
+        return any(self.for_url(u).breaker.available() for u in urls)
+
+    def hedged_get(self, urls, **kwargs):
+        # First usable answer wins. A failed attempt starts the next host at
+        # once, a slow one after HEDGE_DELAY. Attempts live no longer than
+        # this call: losers are killed once there is a winner, and all of
+        # them when the tick deadline kills the caller.
+        answers = eventlet.queue.LightQueue()
+        pending = list(urls)
+        attempts = []
+        inflight = 0
+        launch = True
+        last = None
+        alternate_kwargs = dict(kwargs)
+        if kwargs.get("headers"):
+            alternate_kwargs["headers"] = {
+                k: v for k, v in kwargs["headers"].items() if k not in VALIDATOR_HEADERS
+            }
+
+        def attempt(u):
+            try:
+                options = kwargs if u == urls[0] else alternate_kwargs
+                answers.put((u, self.for_url(u).get(u, **options), None))
+            except Exception as e:
+                answers.put((u, None, e))
+
+        try:
+            while pending or inflight:
+                if pending and launch:
+                    if inflight:
+                        self.hedged += 1
+                    elif last is not None:
+                        self.failovers += 1
+                    attempts.append(eventlet.spawn(attempt, pending.pop(0)))
+                    inflight += 1
+                    launch = False
+                try:
+                    u, resp, error = answers.get(timeout=HEDGE_DELAY if pending else None)
+                except eventlet.queue.Empty:
+                    launch = True
+                    continue
+                inflight -= 1
+                if error is None and resp.status_code not in RETRYABLE_STATUSES:
+                    if u != urls[0]:
+                        self.hedge_wins += 1
+                    if isinstance(last, (requests.Response, httpx.Response)):
+                        last.close()
+                    return resp
+                if isinstance(last, (requests.Response, httpx.Response)):
+                    last.close()
+                last = resp if error is None else error
+                launch = True
+        finally:
+            for gt in attempts:
+                gt.kill()
+            # Answers that landed after the winner
+            while not answers.empty():
+                _, resp, _ = answers.get_nowait()
+                if resp is not None:
+                    resp.close()
+
+        # Every host failed: surface the last status or error to the caller
+        if isinstance(last, Exception):
+            raise last
+        return last
+
+    def stats(self):
+        return {
+            "clients": [c.stats() for c in self.clients.values()],
+            "dns": dns_cache.stats(),
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
+
+upstream = UpstreamClients()
+
+if UPSTREAM_HTTP2 and not HTTP2_AVAILABLE:
+    upstream_log.warning("⚠️ UPSTREAM_HTTP2 is set but the h2 package is missing, using HTTP/1.1 pools")
+
+# =============================================
+# RECORD / REPLAY
+# =============================================
+# UPSTREAM_RECORD=path appends every upstream answer (or error) to a
+# gzipped JSON-lines file. UPSTREAM_REPLAY=path serves those answers
+# instead of the network, on a virtual clock stepped one fetch interval
+# per tick and slept 1/REPLAY_SPEED of it (0 = as fast as possible).
+UPSTREAM_RECORD = os.environ.get("UPSTREAM_RECORD")
+UPSTREAM_REPLAY = os.environ.get("UPSTREAM_REPLAY")
+REPLAY_SPEED = float(os.environ.get("REPLAY_SPEED", 1))
+RECORD_FLUSH_INTERVAL = float(os.environ.get("RECORD_FLUSH_INTERVAL", 2))
+
+# Response headers kept in a recording; the rest only cost space
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+class ReplayError(Exception):
+    pass
+
+def replay_key(url):
+    # Alternate Axiom hosts answer the same request, so the host is not
+    # part of the key
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}"
+
+class RecordedResponse:
+    # The parts of a requests/httpx response the fetch path reads
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.raw = None
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return loads_json(self.content)
+
+    def close(self):
+        pass
+
+class UpstreamRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.queue = real_queue.Queue()
+        self.digests = {}
+        self.recorded = 0
+        self.unchanged = 0
+        self.writer = real_threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer.start()
+        upstream_log.info(f"⏺️ Recording upstream responses to {path}")
+
+    def record(self, resp):
+        # The body is read here, so recorded responses are never streamed
+        url = str(resp.url)
+        content = resp.content
+        key = replay_key(url)
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        entry = {
+            "t": time.time(),
+            "url": url,
+            "status": resp.status_code,
+            "headers": {name: resp.headers[name] for name in RECORDED_HEADERS if name in resp.headers},
+        }
+        # Unchanged bodies are written once per key
+        if self.digests.get(key) == digest:
+            entry["same"] = True
+            self.unchanged += 1
+        else:
+            self.digests[key] = digest
+            try:
+                entry["body"] = content.decode("utf-8")
+            except UnicodeDecodeError:
+                entry["body"] = base64.b64encode(content).decode()
+                entry["b64"] = True
+        self.queue.put_nowait(entry)
+        resp.close()
+        return RecordedResponse(url, resp.status_code, entry["headers"], content)
+
+    def record_error(self, url, error):
+        self.queue.put_nowait({"t": time.time(), "url": url, "error": f"{type(error).__name__}: {error}"})
+
+    def _writer_loop(self):
+        while True:
+            batch = [self.queue.get()]
+            real_time.sleep(RECORD_FLUSH_INTERVAL)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except real_queue.Empty:
+                    break
+            try:
+                # One gzip member per batch keeps the file append-only
+                with gzip.open(self.path, "ab") as f:
+                    f.write(b"".join(dumps_bytes(entry) + b"\n" for entry in batch))
+                self.recorded += len(batch)
+            except Exception as e:
+                upstream_log.error(f"❌ Error writing recording: {e}")
+
+    def stats(self):
+        return {"mode": "record", "path": self.path, "recorded": self.recorded, "unchanged": self.unchanged, "queued": self.queue.qsize()}
+
+class UpstreamReplay:
+    # Reads the recording forward as the virtual clock advances, keeping
+    # only the latest answer per request
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "rb")
+        self.latest = {}
+        self.bodies = {}
+        self.served = 0
+        self.misses = 0
+        self.upcoming = self._read()
+        if self.upcoming is None:
+            raise ReplayError(f"recording {path} is empty")
+        self.started_at = self.upcoming["t"]
+        self.clock = self.started_at
+        self.advance(self.clock)
+        upstream_log.info(f"⏯️ Replaying {path} from {datetime.fromtimestamp(self.started_at).isoformat()} at {REPLAY_SPEED or 'max'}x")
+
+    def _read(self):
+        line = self.file.readline()
+        return loads_json(line) if line else None
+
+    def advance(self, clock):
+        self.clock = clock
+        while self.upcoming is not None and self.upcoming["t"] <= clock:
+            entry = self.upcoming
+            key = replay_key(entry["url"])
+            if "body" in entry:
+                body = entry["body"]
+                self.bodies[key] = base64.b64decode(body) if entry.get("b64") else body.encode("utf-8")
+            self.latest[key] = entry
+            self.upcoming = self._read()
+
+    @property
+    def finished(self):
+        return self.upcoming is None
+
+    def now(self):
+        return self.clock
+
+    def get(self, url):
+        key = replay_key(url)
+        entry = self.latest.get(key)
+        if entry is None:
+            self.misses += 1
+            raise ReplayError(f"no recorded answer for {url}")
+        if "error" in entry:
+            raise ReplayError(entry["error"])
+        self.served += 1
+        return RecordedResponse(url, entry["status"], entry.get("headers", {}), self.bodies.get(key, b""))
+
+    def stats(self):
+        return {
+            "mode": "replay",
+            "path": self.path,
+            "speed": REPLAY_SPEED,
+            "clock": datetime.fromtimestamp(self.clock).isoformat(),
+            "elapsed": round(self.clock - self.started_at, 1),
+            "finished": self.finished,
+            "served": self.served,
+            "misses": self.misses,
+        }
+
+upstream_recorder = UpstreamRecorder(UPSTREAM_RECORD) if UPSTREAM_RECORD and not UPSTREAM_REPLAY else None
+upstream_replay = UpstreamReplay(UPSTREAM_REPLAY) if UPSTREAM_REPLAY else None
+
+def upstream_now():
+    # Time as the upstream data knows it: the virtual clock during replay
+    return upstream_replay.now() if upstream_replay else time.time()
+
+# =============================================
+# PAIR REGISTRY
+# =============================================
+def build_axiom_endpoints(pair_address):
+    return {
+        "pair_info": f"{AXIOM_API_URLS['api9']}/pair-info?pairAddress={pair_address}",
+        "token_info": f"{AXIOM_API_URLS['api9']}/token-info?pairAddress={pair_address}",
+        "pair_stats": f"{AXIOM_API_URLS['api9']}/pair-stats?pairAddress={pair_address}",
+        "token_holders": f"{AXIOM_API_URLS['api10']}/token-info?pairAddress={pair_address}"
+    }
+
+def build_holder_url(pair_address):
+    return f"{AXIOM_API_URLS['api6']}/holder-data-v3?pairAddress={pair_address}&onlyTrackedWallets=false"
+
+def build_x_urls(community_id):
+    return {
+        "timeline": (
+            f"{X_BASE_URL}/i/api/graphql/Nyt-88UX4-pPCImZNUl9RQ/CommunityTweetsTimeline"
+            f"?variables=%7B%22communityId%22%3A%22{community_id}%22%2C%22count%22%3A20%2C%22displayLocation%22%3A%22Community%22%2C%22rankingMode%22%3A%22Relevance%22%2C%22withCommunity%22%3Atrue%7D"
+            "&features=%7B%22rweb_video_screen_enabled%22%3Afalse%2C%22payments_enabled%22%3Afalse%2C%22rweb_xchat_enabled%22%3Afalse%2C%22profile_label_improvements_pcf_label_in_post_enabled%22%3Atrue%2C%22rweb_tipjar_consumption_enabled%22%3Atrue%2C%22verified_phone_label_enabled%22%3Atrue%2C%22creator_subscriptions_tweet_preview_api_enabled%22%3Atrue%2C%22responsive_web_graphql_timeline_navigation_enabled%22%3Atrue%2C%22responsive_web_graphql_skip_user_profile_image_extensions_enabled%22%3Afalse%2C%22premium_content_api_read_enabled%22%3Afalse%2C%22communities_web_enable_tweet_community_results_fetch%22%3Atrue%2C%22c9s_tweet_anatomy_moderator_badge_enabled%22%3Atrue%2C%22responsive_web_grok_analyze_button_fetch_trends_enabled%22%3Afalse%2C%22responsive_web_grok_analyze_post_followups_enabled%22%3Atrue%2C%22responsive_web_jetfuel_frame%22%3Atrue%2C%22responsive_web_grok_share_attachment_enabled%22%3Atrue%2C%22articles_preview_enabled%22%3Atrue%2C%22responsive_web_edit_tweet_api_enabled%22%3Atrue%2C%22graphql_is_translatable_rweb_tweet_is_translatable_enabled%22%3Atrue%2C%22view_counts_everywhere_api_enabled%22%3Atrue%2C%22longform_notetweets_consumption_enabled%22%3Atrue%2C%22responsive_web_twitter_article_tweet_consumption_enabled%22%3Atrue%2C%22tweet_awards_web_tipping_enabled%22%3Afalse%2C%22responsive_web_grok_show_grok_translated_post%22%3Atrue%2C%22responsive_web_grok_analysis_button_from_backend%22%3Atrue%2C%22creator_subscriptions_quote_tweet_preview_enabled%22%3Afalse%2C%22freedom_of_speech_not_reach_fetch_enabled%22%3Atrue%2C%22standardized_nudges_misinfo%22%3Atrue%2C%22tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled%22%3Atrue%2C%22longform_notetweets_rich_text_read_enabled%22%3Atrue%2C%22longform_notetweets_inline_media_enabled%22%3Atrue%2C%22responsive_web_grok_image_annotation_enabled%22%3Atrue%2C%22responsive_web_grok_imagine_annotation_enabled%22%3Atrue%2C%22responsive_web_grok_community_note_auto_translation_is_enabled%22%3Afalse%2C%22responsive_web_enhance_cards_enabled%22%3Afalse%7D"
+        ),
+        "fetchOne": (
+            f"{X_BASE_URL}/i/api/graphql/pbuqwPzh0Ynrw8RQY3esYA/CommunitiesFetchOneQuery"
+            f"?variables=%7B%22communityId%22%3A%22{community_id}%22%2C%22withDmMuting%22%3Afalse%2C%22withGrokTranslatedBio%22%3Afalse%7D"
+            "&features=%7B%22payments_enabled%22%3Afalse%2C%22profile_label_improvements_pcf_label_in_post_enabled%22%3Atrue%2C%22responsive_web_graphql_skip_user_profile_image_extensions_enabled%22%3Afalse%2C%22responsive_web_graphql_timeline_navigation_enabled%22%3Atrue%2C%22rweb_tipjar_consumption_enabled%22%3Atrue%2C%22verified_phone_label_enabled%22%3Atrue%7D"
+        ),
+    }
+
+# Adaptive per-source polling: a source whose payload did not change has
+# its interval stretched by SOURCE_BACKOFF up to its ceiling, a changed one
+# drops back to the pair's fetch interval
+SOURCE_BACKOFF = float(os.environ.get("SOURCE_BACKOFF", 1.5))
+SOURCE_MAX_INTERVAL = float(os.environ.get("SOURCE_MAX_INTERVAL", 30))
+SOURCE_MAX_INTERVALS = {
+    "pair_info": 300,
+    "fetchOne": 300,
+    "token_info": 60,
+}
+# A failing source retries on the next tick once, then backs off
+# exponentially (with jitter) up to SOURCE_FAILURE_MAX_INTERVAL
+SOURCE_FAILURE_MAX_INTERVAL = float(os.environ.get("SOURCE_FAILURE_MAX_INTERVAL", 60))
+
+# Returned by a source fetch when upstream has nothing new
+UNCHANGED = object()
+
+class SourceState:
+    def __init__(self, name, max_interval):
+        self.name = name
+        self.max_interval = max_interval
+        self.interval = None
+        self.next_at = 0
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.pending_digest = None
+        self.value = None
+        self.fetches = 0
+        self.unchanged = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.errors = 0
+        self.last_success = None
+
+    def is_due(self, now, base):
+        # Ticks land every `base` seconds, so allow a little early slack
+        return self.next_at <= now + 0.25 * base
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def observe(self, resp, digest=True):
+        # False when upstream answered 304 or sent the same body again;
+        # streamed bodies are hashed by the parser through same_payload
+        if resp.status_code == 304:
+            self.not_modified += 1
+            return False
+        if resp.status_code != 200:
+            return True
+        self.etag = resp.headers.get("ETag") or self.etag
+        self.last_modified = resp.headers.get("Last-Modified") or self.last_modified
+        if digest:
+            return not self.same_payload(hashlib.blake2b(resp.content, digest_size=16).digest())
+        return True
+
+    def same_payload(self, digest):
+        self.pending_digest = digest
+        if digest == self.digest and self.value is not None:
+            self.unchanged += 1
+            return True
+        return False
+
+    def record(self, value, now, base):
+        self.fetches += 1
+        if value is UNCHANGED:
+            interval = max(self.interval or base, base) * SOURCE_BACKOFF
+            self.interval = min(interval, max(self.max_interval, base))
+        else:
+            self.value = value
+            self.digest = self.pending_digest
+            self.interval = base
+        self.failures = 0
+        self.last_success = now
+        self.next_at = now + self.interval
+
+    def failed(self, now, base):
+        # The learned interval is kept for when the source recovers
+        self.errors += 1
+        self.failures += 1
+        if self.failures == 1:
+            self.next_at = now
+            return
+        delay = min(base * 2 ** (self.failures - 1), max(SOURCE_FAILURE_MAX_INTERVAL, base))
+        self.next_at = now + random.uniform(delay / 2, delay)
+
+    def to_dict(self):
+        return {
+            "interval": round(self.interval, 2) if self.interval else None,
+            "fetches": self.fetches,
+            "unchanged": self.unchanged,
+            "notModified": self.not_modified,
+            "errors": self.errors,
+            "failures": self.failures,
+            "lastSuccess": self.last_success,
+        }
+
+def timeline_page_url(timeline_url, cursor):
+    # Same timeline query, continued from a Bottom cursor
+    parts = urlsplit(timeline_url)
+    query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    variables = json.loads(query["variables"])
+    variables["cursor"] = cursor
+    query["variables"] = json.dumps(variables, separators=(",", ":"))
+    return parts._replace(query=urlencode(query)).geturl()
+
+class TrackedPair:
+    def __init__(self, pair_address, community_id, interval=fetch_interval):
+        self.pair_address = pair_address
+        self.storage = TimeSeriesStore(PAIR_HISTORY_ENTRIES, pair_address)
+        self.extrema = ExtremaTracker()
+        self.indicators = IndicatorEngine()
+        self.topic_cache = {}
+        self.wallets = WalletIndex()
+        self.sources = {}
+        # Web workers show the ingest process's source stats instead
+        self.mirrored_sources = None
+        self.tweets = TweetStore(journal=BX_ROLE == "ingest")
+        self.axiom_endpoints = build_axiom_endpoints(pair_address)
+        self.holder_url = build_holder_url(pair_address)
+        self.added_at = time.time()
+        self.last_fetch_at = None
+        self.next_fetch_at = 0
+        self.in_flight = False
+        self.set_community(community_id)
+        self.set_interval(interval)
+
+    def set_community(self, community_id):
+        self.community_id = community_id
+        self.x_urls = build_x_urls(community_id)
+        for name in self.x_urls:
+            self.sources.pop(name, None)
+        self.tweets = TweetStore(journal=BX_ROLE == "ingest")
+
+    def source(self, name):
+        if name not in self.sources:
+            self.sources[name] = SourceState(name, SOURCE_MAX_INTERVALS.get(name, SOURCE_MAX_INTERVAL))
+        return self.sources[name]
+
+    def source_urls(self):
+        return {**self.axiom_endpoints, "holders": self.holder_url, **self.x_urls}
+
+    def set_interval(self, interval):
+        self.fetch_interval = max(MIN_FETCH_INTERVAL, float(interval))
+
+    def is_due(self, now):
+        return not self.in_flight and now >= self.next_fetch_at
+
+    def schedule_next(self):
+        self.last_fetch_at = time.time()
+        self.next_fetch_at = self.last_fetch_at + self.fetch_interval
+
+    def to_dict(self):
+        return {
+            "pairAddress": self.pair_address,
+            "communityId": self.community_id,
+            "fetchInterval": self.fetch_interval,
+            "dataPoints": len(self.storage),
+            "historyCapacity": self.storage.capacity,
+            "historyBytes": self.storage.nbytes(),
+            "lastFetchAt": datetime.fromtimestamp(self.last_fetch_at).isoformat() if self.last_fetch_at else None,
+            "sources": (
+                self.mirrored_sources if self.mirrored_sources is not None
+                else {name: source.to_dict() for name, source in self.sources.items()}
+            ),
+            "tweetStore": self.tweets.stats(),
+        }
+
+class PairRegistry:
+    def __init__(self):
+        self.pairs = {}
+        self.default_address = None
+        self.lock = threading.Lock()
+
+    def add(self, pair_address, community_id, interval=None):
+        with self.lock:
+            pair = self.pairs.get(pair_address)
+            if pair:
+                # Re-configuring a tracked pair keeps its history
+                if community_id != pair.community_id:
+                    pair.set_community(community_id)
+                if interval is not None:
+                    pair.set_interval(interval)
+            else:
+                pair = TrackedPair(pair_address, community_id, interval if interval is not None else fetch_interval)
+                restore_history(pair)
+                self.pairs[pair_address] = pair
+            self.default_address = pair_address
+        if history_db:
+            history_db.save_pair(pair)
+        publish_pairs()
+        return pair
+
+    def remove(self, pair_address):
+        with self.lock:
+            pair = self.pairs.pop(pair_address, None)
+            if pair_address == self.default_address:
+                self.default_address = next(reversed(self.pairs), None)
+        if pair and history_db:
+            history_db.remove_pair(pair_address)
+        publish_pairs()
+        return pair
+
+    def get(self, pair_address=None):
+        if pair_address:
+            return self.pairs.get(pair_address)
+        if self.default_address:
+            return self.pairs.get(self.default_address)
+        return None
+
+    def all(self):
+        return list(self.pairs.values())
+
+    def seconds_until_next_due(self, now):
+        waits = [p.next_fetch_at - now for p in self.pairs.values() if not p.in_flight]
+        if not waits:
+            return 0.5
+        return min(max(0.1, min(waits)), fetch_interval)
+
+pair_registry = PairRegistry()
+
+def restore_history(pair):
+    # Warm a newly tracked pair's ring buffer from the on-disk history
+    if not history_db:
+        return
+    try:
+        lists = history_db.query(pair.pair_address, limit=pair.storage.capacity, newest=True)
+        for i, ts in enumerate(lists["ts"]):
+            values = {name: lists[name][i] for name in SERIES_COLUMNS}
+            pair.storage.append(ts, values)
+            pair.extrema.update(ts, values["marketCapUSD"])
+            pair.indicators.update(ts, values)
+        snapshot = history_db.latest_snapshot(pair.pair_address)
+        if snapshot:
+            pair.storage.restore_latest(snapshot)
+        if lists["ts"]:
+            storage_log.info(f"💽 Restored {len(lists['ts'])} samples for {pair.pair_address}")
+    except Exception as e:
+        storage_log.error(f"❌ Error restoring history for {pair.pair_address}: {e}")
+
+def restore_saved_pairs():
+    if not history_db:
+        return
+    for pair_address, saved_community_id, interval in history_db.saved_pairs():
+        pair_registry.add(pair_address, saved_community_id, interval)
+    if pair_registry.pairs:
+        storage_log.info(f"💽 Resumed tracking {len(pair_registry.pairs)} pairs")
+
+# Shared engine: one green pool runs the due pairs of every tick
+fetch_pool = eventlet.GreenPool(MAX_CONCURRENT_PAIR_FETCHES)
+
+# Empty storage served when no pair is configured yet
+empty_storage = TimeSeriesStore(0)
+
+class PairNotFound(Exception):
+    pass
+
+@app.errorhandler(PairNotFound)
+def handle_pair_not_found(e):
+    return jsonify({"error": "Pair is not tracked", "pairAddress": str(e)}), 404
+
+class InvalidArgument(Exception):
+    pass
+
+@app.errorhandler(InvalidArgument)
+def handle_invalid_argument(e):
+    return jsonify({"error": str(e)}), 400
+
+def pair_room(pair_address):
+    return f"pair:{pair_address}"
+
+DEFAULT_PAIR_ROOM = "pair:default"
+
+# =============================================
+# SOCKET.IO FAN-OUT
+# =============================================
+# sid -> {"pair": address or None for the default pair, "mode": "full"|"patch", "acked": version}
+socket_clients = {}
+
+def client_pair_address(client):
+    return client["pair"] or pair_registry.default_address
+
+# Per-client bounded outboxes. Messages go straight to the transport while
+# the client keeps up; once its engine.io queue passes the high-water mark
+# they wait here, a newer message with the same key replaces the pending
+# one and the oldest messages are dropped beyond OUTBOX_LIMIT.
+OUTBOX_LIMIT = int(os.environ.get("OUTBOX_LIMIT", 32))
+TRANSPORT_HIGH_WATER = int(os.environ.get("TRANSPORT_HIGH_WATER", 8))
+OUTBOX_FLUSH_INTERVAL = float(os.environ.get("OUTBOX_FLUSH_INTERVAL", 0.25))
+
+outboxes = {}
+outbox_totals = {"sent": 0, "coalesced": 0, "dropped": 0}
+outbox_flusher_started = False
+
+def transport_depth(sid):
+    # Packets engine.io has accepted for this client but not written yet
+    try:
+        eio_sid = socketio.server.manager.eio_sid_from_sid(sid, '/')
+        return socketio.server.eio.sockets[eio_sid].queue.qsize()
+    except (KeyError, AttributeError, TypeError):
+        return 0
+
+class ClientOutbox:
+    def __init__(self, sid):
+        self.sid = sid
+        self.pending = OrderedDict()
+        self.seq = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_version = None
+        self.last_sent_at = None
+
+    def put(self, event, payload, key=None):
+        if key is None:
+            self.seq += 1
+            key = (event, self.seq)
+        if self.pending.pop(key, None) is not None:
+            self.coalesced += 1
+            outbox_totals["coalesced"] += 1
+        self.pending[key] = (event, payload, time.time())
+        while len(self.pending) > OUTBOX_LIMIT:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+            outbox_totals["dropped"] += 1
+        self.flush()
+
+    def flush(self):
+        while self.pending and transport_depth(self.sid) < TRANSPORT_HIGH_WATER:
+            _, (event, payload, _) = self.pending.popitem(last=False)
+            socketio.emit(event, payload, room=self.sid)
+            self.sent += 1
+            outbox_totals["sent"] += 1
+            self.last_sent_at = time.time()
+            if event in ("data_update", "data_patch"):
+                self.last_version = payload.get("version")
+
+    def lag_seconds(self):
+        if not self.pending:
+            return 0
+        return time.time() - next(iter(self.pending.values()))[2]
+
+def deliver(sid, event, payload, key=None):
+    outbox = outboxes.get(sid)
+    if outbox:
+        outbox.put(event, payload, key)
+
+def deliver_to_room(room, event, payload, key=None):
+    for sid, _ in socketio.server.manager.get_participants('/', room):
+        deliver(sid, event, payload, key)
+
+def outbox_flusher():
+    while True:
+        socketio.sleep(OUTBOX_FLUSH_INTERVAL)
+        for outbox in list(outboxes.values()):
+            if outbox.pending:
+                try:
+                    outbox.flush()
+                except Exception as e:
+                    socket_log.error(f"❌ Outbox flush failed for {outbox.sid}: {e}")
+
+def ensure_outbox_flusher():
+    global outbox_flusher_started
+    if not outbox_flusher_started:
+        outbox_flusher_started = True
+        socketio.start_background_task(outbox_flusher)
+
+def diff_snapshots(old, new, path=None):
+    # Path-level diff: dicts are walked, any other changed value (including
+    # lists such as holders or the timeline) is replaced as a whole
+    path = path or []
+    ops = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append({"op": "set", "path": path + [key], "value": value})
+            continue
+        previous = old[key]
+        if isinstance(value, dict) and isinstance(previous, dict):
+            ops.extend(diff_snapshots(previous, value, path + [key]))
+        elif previous != value:
+            ops.append({"op": "set", "path": path + [key], "value": value})
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": path + [key]})
+    return ops
+
+def send_full_snapshot(sid, snapshot):
+    deliver(sid, 'data_update', snapshot, key='data_update')
+    client = socket_clients.get(sid)
+    if client:
+        client["acked"] = snapshot.get("version", 0)
+
+# Topic payloads cut from a snapshot, so small widgets only receive the
+# section they render
+def marketcap_topic(snapshot):
+    axiom = snapshot.get("axiom", {})
+    return {key: axiom.get(key) for key in (
+        "marketCapUSD", "marketCapSol", "volumeUSD", "liquidityUSD", "solPriceUSD",
+        "fibLevel62", "fibLevel50", "fibLevels",
+    )}
+
+def buys_sells_topic(snapshot):
+    axiom = snapshot.get("axiom", {})
+    return {key: axiom.get(key) for key in (
+        "buyVolumeUSD", "sellVolumeUSD", "volumeUSD", "buyVolumeSol", "sellVolumeSol",
+        "buyCount", "sellCount", "netCount",
+    )}
+
+def holders_topic(snapshot):
+    axiom = snapshot.get("axiom", {})
+    return {key: axiom.get(key) for key in (
+        "numHolders", "totalHolders", "walletAgeCounts", "top10HoldersPercent",
+        "insidersHoldPercent", "bundlersHoldPercent", "snipersHoldPercent",
+    )}
+
+def wallet_age_topic(snapshot):
+    axiom = snapshot.get("axiom", {})
+    return {
+        "distribution": axiom.get("walletAgeCounts", {}),
+        "stats": axiom.get("walletAgeStats"),
+        "totalHolders": axiom.get("totalHolders", 0),
+        "holders": axiom.get("holders", []),
+    }
+
+def social_topic(snapshot):
+    return {
+        **snapshot.get("social", {}),
+        "uniqueAuthors": snapshot.get("unique_authors", 0),
+        "community": snapshot.get("x_data", {}).get("fetchOne", {}),
+    }
+
+def indicators_topic(snapshot):
+    return snapshot.get("indicators", {})
+
+def tweets_topic(snapshot):
+    return {
+        "timeline": snapshot.get("x_data", {}).get("timeline", []),
+        "authorFollowers": snapshot.get("author_followers", []),
+    }
+
+TOPICS = {
+    "marketcap": marketcap_topic,
+    "buys-sells": buys_sells_topic,
+    "holders": holders_topic,
+    "wallet-age": wallet_age_topic,
+    "social": social_topic,
+    "tweets": tweets_topic,
+    "indicators": indicators_topic,
+}
+
+def topic_room(pair_address, topic):
+    return f"{pair_room(pair_address or 'default')}:topic:{topic}"
+
+def room_has_members(room):
+    return bool(socketio.server.manager.rooms.get('/', {}).get(room))
+
+def topic_message(pair, topic, snapshot, data):
+    return {
+        "pairAddress": pair.pair_address,
+        "topic": topic,
+        "version": snapshot.get("version"),
+        "timestamp": snapshot.get("timestamp"),
+        "data": data,
+    }
+
+def broadcast_topics(pair, snapshot):
+    # Only topics whose payload changed are emitted, and only to their rooms
+    addresses = [pair.pair_address]
+    if pair_registry.default_address == pair.pair_address:
+        addresses.append(None)
+    for topic, build in TOPICS.items():
+        targets = [topic_room(address, topic) for address in addresses]
+        targets = [room for room in targets if room_has_members(room)]
+        if not targets:
+            pair.topic_cache.pop(topic, None)
+            continue
+        data = build(snapshot)
+        if pair.topic_cache.get(topic) == data:
+            continue
+        pair.topic_cache[topic] = data
+        message = topic_message(pair, topic, snapshot, data)
+        for room in targets:
+            deliver_to_room(room, 'topic_update', message, key=('topic_update', room))
+
+def broadcast_snapshot(pair, snapshot):
+    # Full-mode clients receive the snapshot through their pair room
+    deliver_to_room(pair_room(pair.pair_address), 'data_update', snapshot, key='data_update')
+    if pair_registry.default_address == pair.pair_address:
+        deliver_to_room(DEFAULT_PAIR_ROOM, 'data_update', snapshot, key='data_update')
+
+    # Patch-mode clients are grouped by their acknowledged version so each
+    # distinct diff is computed once
+    groups = {}
+    for sid, client in list(socket_clients.items()):
+        if client["mode"] == "patch" and client_pair_address(client) == pair.pair_address:
+            groups.setdefault(client["acked"], []).append(sid)
+
+    for base, sids in groups.items():
+        base_snapshot = pair.storage.snapshot_at(base)
+        if base_snapshot is None:
+            for sid in sids:
+                send_full_snapshot(sid, snapshot)
+            continue
+        patch = {
+            "pairAddress": pair.pair_address,
+            "base": base,
+            "version": snapshot["version"],
+            "ops": diff_snapshots(base_snapshot, snapshot),
+        }
+        # Patches share the client's acked base, so a newer one supersedes
+        # a pending one
+        for sid in sids:
+            deliver(sid, 'data_patch', patch, key='data_patch')
+
+    broadcast_topics(pair, snapshot)
+
+def attach_client(sid):
+    # Full-mode clients that do not name a pair follow the default pair room
+    client = socket_clients[sid]
+    for room in [DEFAULT_PAIR_ROOM] + [pair_room(p.pair_address) for p in pair_registry.all()]:
+        leave_room(room)
+    if client["mode"] == "topics":
+        return
+    if client["mode"] == "full":
+        join_room(pair_room(client["pair"]) if client["pair"] else DEFAULT_PAIR_ROOM)
+
+    latest_data = get_latest_data(client["pair"])
+    if latest_data:
+        send_full_snapshot(sid, latest_data)
+
 # Socket.IO event handlers
 @socketio.on('connect')
 def handle_connect():
-    print(f"✅ Client connected: {request.sid}")
-    latest_data = get_latest_data()
+    socket_log.info(f"✅ Client connected: {request.sid}")
+    ensure_outbox_flusher()
+    outboxes[request.sid] = ClientOutbox(request.sid)
+    socket_clients[request.sid] = {
+        "pair": request.args.get("pair"),
+        "mode": "patch" if request.args.get("mode") == "patch" else "full",
+        "acked": 0,
+    }
+    topics = request.args.get("topics")
+    if topics:
+        subscribe_topics(request.sid, request.args.get("pair"), topics.split(","))
+    else:
+        attach_client(request.sid)
+
+@socketio.on('select_pair')
+def handle_select_pair(data):
+    pair_address = (data or {}).get("pair") if isinstance(data, dict) else data
+    socket_clients[request.sid]["pair"] = pair_address
+    attach_client(request.sid)
+
+@socketio.on('set_mode')
+def handle_set_mode(data):
+    mode = (data or {}).get("mode") if isinstance(data, dict) else data
+    socket_clients[request.sid]["mode"] = "patch" if mode == "patch" else "full"
+    attach_client(request.sid)
+
+def subscribe_topics(sid, pair_address, topics):
+    # Topic subscribers stop receiving full snapshots
+    client = socket_clients[sid]
+    if client["mode"] != "topics":
+        client["mode"] = "topics"
+        attach_client(sid)
+
+    subscribed = [t for t in topics if t in TOPICS]
+    pair = pair_registry.get(pair_address)
+    latest_data = pair.storage.get_latest() if pair else {}
+    for topic in subscribed:
+        room = topic_room(pair_address, topic)
+        join_room(room)
+        if latest_data:
+            data = TOPICS[topic](latest_data)
+            pair.topic_cache[topic] = data
+            deliver(sid, 'topic_update', topic_message(pair, topic, latest_data, data), key=('topic_update', room))
+    return {"subscribed": subscribed, "unknown": [t for t in topics if t not in TOPICS]}
+
+def topic_request(data):
+    data = data or {}
+    topics = data.get("topics") or []
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    return data.get("pair"), topics
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    pair_address, topics = topic_request(data)
+    return subscribe_topics(request.sid, pair_address, topics)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(data):
+    pair_address, topics = topic_request(data)
+    for topic in topics:
+        leave_room(topic_room(pair_address, topic))
+    return {"unsubscribed": topics}
+
+@socketio.on('ack_version')
+def handle_ack_version(data):
+    version = (data or {}).get("version") if isinstance(data, dict) else data
+    client = socket_clients.get(request.sid)
+    if client and isinstance(version, int) and version > client["acked"]:
+        client["acked"] = version
+
+@socketio.on('resync')
+def handle_resync(data=None):
+    # Sent by a patch-mode client that detected a version gap
+    client = socket_clients.get(request.sid)
+    latest_data = get_latest_data(client["pair"]) if client else {}
     if latest_data:
-        socketio.emit('data_update', latest_data, room=request.sid)
+        send_full_snapshot(request.sid, latest_data)
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    print(f"🔌 Client disconnected: {request.sid}")
+    socket_clients.pop(request.sid, None)
+    outboxes.pop(request.sid, None)
+    socket_log.info(f"🔌 Client disconnected: {request.sid}")
+
+@app.route("/api/upstream")
+def upstream_stats():
+    stats = upstream.stats()
+    if upstream_recorder or upstream_replay:
+        stats["capture"] = (upstream_recorder or upstream_replay).stats()
+    return jsonify(stats)
+
+@app.route("/api/logs")
+def recent_logs():
+    level = request.args.get("level", "DEBUG").upper()
+    if not isinstance(logging.getLevelName(level), int):
+        return jsonify({"error": f"Unknown level: {level}"}), 400
+    try:
+        since = float(request.args["since"]) if "since" in request.args else None
+        limit = min(max(int(request.args.get("limit", 200)), 1), LOG_BUFFER_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    entries = log_pipeline.query(logging.getLevelName(level), request.args.get("source"), since, limit)
+    return jsonify({"logs": entries, "stats": log_pipeline.stats()})
+
+@app.route("/metrics")
+def metrics():
+    return generate_latest(metrics_registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
 
 # Debug endpoint
 @app.route("/api/socket-debug")
 def socket_debug():
     try:
         rooms = socketio.server.manager.rooms.get('/', {})
+        clients = []
+        for sid, outbox in list(outboxes.items()):
+            client = socket_clients.get(sid, {})
+            pair = pair_registry.get(client_pair_address(client)) if client else None
+            latest_version = pair.storage.latest.get("version") if pair else None
+            clients.append({
+                "sid": sid,
+                "pair": client.get("pair"),
+                "mode": client.get("mode"),
+                "pending": len(outbox.pending),
+                "transportDepth": transport_depth(sid),
+                "lagSeconds": round(outbox.lag_seconds(), 3),
+                "lastVersion": outbox.last_version,
+                "versionsBehind": latest_version - outbox.last_version if latest_version and outbox.last_version else None,
+                "sent": outbox.sent,
+                "coalesced": outbox.coalesced,
+                "dropped": outbox.dropped,
+            })
         return jsonify({
-            "connected_clients": len(rooms),
-            "client_ids": list(rooms.keys()),
+            "connected_clients": len(socket_clients),
+            "client_ids": list(socket_clients.keys()),
+            "rooms": {room: len(members) for room, members in list(rooms.items()) if room not in socket_clients},
             "server_time": datetime.now().isoformat(),
-            "status": "active"
+            "status": "active",
+            "outbox": {**outbox_totals, "queueDepth": sum(c["pending"] for c in clients)},
+            "clients": clients,
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# =============================================
+# SNAPSHOT BUS (ingest -> web workers)
+# =============================================
+# Length-prefixed JSON frames over a local Unix socket. The ingest process
+# publishes the tracked pairs and every new snapshot; each web worker
+# mirrors them and sends pair commands back the same way.
+SNAPSHOT_SOCKET = os.environ.get("SNAPSHOT_SOCKET", "/tmp/kluxback-snapshots.sock")
+BUS_QUEUE_LIMIT = int(os.environ.get("BUS_QUEUE_LIMIT", 256))
+
+def write_frame(conn, message):
+    body = dumps_bytes(message)
+    conn.sendall(len(body).to_bytes(4, "big") + body)
+
+def read_frame(reader):
+    header = reader.read(4)
+    if len(header) < 4:
+        return None
+    return loads_json(reader.read(int.from_bytes(header, "big")))
+
+def pairs_message():
+    return {
+        "type": "pairs",
+        "default": pair_registry.default_address,
+        "pairs": [
+            {"pairAddress": p.pair_address, "communityId": p.community_id, "fetchInterval": p.fetch_interval}
+            for p in pair_registry.all()
+        ],
+    }
+
+def snapshot_message(pair, snapshot):
+    return {"type": "snapshot", "pair": pair.pair_address, "token": pair.storage.token, "snapshot": snapshot}
+
+def point_message(pair, ts, values):
+    return {
+        "type": "point", "pair": pair.pair_address, "token": pair.storage.token,
+        "version": pair.storage.version, "ts": ts, "values": values,
+    }
+
+def pair_state_message(pair, tweets):
+    # Fetcher-side state the web routes read: source stats and the tweet store
+    return {
+        "type": "pair_state",
+        "pair": pair.pair_address,
+        "lastFetchAt": pair.last_fetch_at,
+        "sources": {name: source.to_dict() for name, source in list(pair.sources.items())},
+        "tweets": tweets,
+    }
+
+class SnapshotPublisher:
+    def __init__(self, path):
+        self.path = path
+        self.subscribers = {}
+        self.published = 0
+        self.dropped = 0
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(64)
+        eventlet.spawn_n(self._accept_loop, listener)
+        bus_log.info(f"📡 Publishing snapshots on {self.path}")
+
+    def _accept_loop(self, listener):
+        while True:
+            conn, _ = listener.accept()
+            eventlet.spawn_n(self._serve, conn)
+
+    def _serve(self, conn):
+        # Registered before the sync is written so no snapshot falls in
+        # between; a duplicate is ignored by the subscriber's version check
+        outbox = eventlet.queue.LightQueue(BUS_QUEUE_LIMIT)
+        key = id(outbox)
+        self.subscribers[key] = (outbox, conn)
+        writer = eventlet.spawn(self._write_loop, conn, outbox)
+        bus_log.info(f"📡 Web worker subscribed ({len(self.subscribers)} total)")
+        try:
+            reader = conn.makefile("rb")
+            while True:
+                message = read_frame(reader)
+                if message is None:
+                    break
+                self.handle_command(message)
+        except (OSError, ValueError) as e:
+            bus_log.warning(f"⚠️ Web worker connection lost: {e}")
+        finally:
+            self.subscribers.pop(key, None)
+            writer.kill()
+            conn.close()
+
+    def _write_loop(self, conn, outbox):
+        try:
+            write_frame(conn, pairs_message())
+            for pair in pair_registry.all():
+                for snapshot in list(pair.storage.recent):
+                    write_frame(conn, snapshot_message(pair, snapshot))
+                write_frame(conn, pair_state_message(pair, pair.tweets.export()))
+            while True:
+                write_frame(conn, outbox.get())
+        except OSError:
+            conn.close()
+
+    def publish(self, message):
+        self.published += 1
+        for key, (outbox, conn) in list(self.subscribers.items()):
+            try:
+                outbox.put_nowait(message)
+            except eventlet.queue.Full:
+                # A worker that fell this far behind resyncs on reconnect
+                self.dropped += 1
+                self.subscribers.pop(key, None)
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def handle_command(self, message):
+        if message.get("type") != "command":
+            return
+        if message.get("op") == "add":
+            pair_registry.add(message["pairAddress"], message.get("communityId"), message.get("fetchInterval"))
+        elif message.get("op") == "remove":
+            pair_registry.remove(message["pairAddress"])
+
+    def stats(self):
+        return {"role": "publisher", "subscribers": len(self.subscribers), "published": self.published, "dropped": self.dropped}
+
+class SnapshotSubscriber:
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+        self.received = 0
+        self.reconnects = 0
+
+    def start(self):
+        eventlet.spawn_n(self._run)
+
+    def _run(self):
+        while True:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                conn.connect(self.path)
+                self.conn = conn
+                bus_log.info(f"📡 Subscribed to snapshots on {self.path}")
+                reader = conn.makefile("rb")
+                while True:
+                    message = read_frame(reader)
+                    if message is None:
+                        break
+                    self.received += 1
+                    self.handle(message)
+            except (OSError, ValueError) as e:
+                bus_log.warning(f"⚠️ Snapshot bus unavailable: {e}")
+            finally:
+                self.conn = None
+                conn.close()
+            self.reconnects += 1
+            time.sleep(1)
+
+    def handle(self, message):
+        if message.get("type") == "pairs":
+            addresses = set()
+            for entry in message["pairs"]:
+                addresses.add(entry["pairAddress"])
+                pair_registry.add(entry["pairAddress"], entry["communityId"], entry["fetchInterval"])
+            for pair_address in list(pair_registry.pairs):
+                if pair_address not in addresses:
+                    pair_registry.remove(pair_address)
+            pair_registry.default_address = message.get("default")
+        elif message.get("type") == "snapshot":
+            pair = pair_registry.pairs.get(message["pair"])
+            snapshot = message["snapshot"]
+            if pair and pair.storage.mirror(snapshot, message["token"]):
+                ts = datetime.fromisoformat(snapshot["timestamp"]).timestamp()
+                pair.extrema.update(ts, snapshot["axiom"]["marketCapUSD"])
+                broadcast_snapshot(pair, snapshot)
+        elif message.get("type") == "point":
+            pair = pair_registry.pairs.get(message["pair"])
+            if pair and message["token"] == pair.storage.token:
+                pair.storage.carry_forward(message["ts"], message["values"], message["version"])
+                pair.extrema.update(message["ts"], message["values"]["marketCapUSD"])
+        elif message.get("type") == "pair_state":
+            pair = pair_registry.pairs.get(message["pair"])
+            if pair:
+                pair.tweets.apply(message["tweets"])
+                pair.mirrored_sources = message["sources"]
+                pair.last_fetch_at = message["lastFetchAt"]
+
+    def send(self, message):
+        with self.lock:
+            if self.conn is None:
+                bus_log.warning("⚠️ Snapshot bus is down, command not forwarded")
+                return False
+            write_frame(self.conn, message)
+            return True
+
+    def stats(self):
+        return {"role": "subscriber", "connected": self.conn is not None, "received": self.received, "reconnects": self.reconnects}
+
+snapshot_publisher = SnapshotPublisher(SNAPSHOT_SOCKET) if BX_ROLE == "ingest" else None
+snapshot_subscriber = SnapshotSubscriber(SNAPSHOT_SOCKET) if BX_ROLE == "web" else None
+
+def publish_pairs():
+    if snapshot_publisher:
+        snapshot_publisher.publish(pairs_message())
+
+def publish_pair_state(pair):
+    if snapshot_publisher:
+        snapshot_publisher.publish(pair_state_message(pair, pair.tweets.drain()))
+
+def track_pair(pair_address, community_id, interval=None):
+    # Web workers track locally right away and have ingest do the fetching
+    pair = pair_registry.add(pair_address, community_id, interval)
+    if snapshot_subscriber:
+        snapshot_subscriber.send({
+            "type": "command", "op": "add",
+            "pairAddress": pair_address, "communityId": community_id, "fetchInterval": interval,
+        })
+    return pair
+
+def untrack_pair(pair_address):
+    pair = pair_registry.remove(pair_address)
+    if pair and snapshot_subscriber:
+        snapshot_subscriber.send({"type": "command", "op": "remove", "pairAddress": pair_address})
+    return pair
+
 # -------------------------
 # FETCH FUNCTIONS
 # -------------------------
-def fetch_axiom_data():
-    if not PAIR_ADDRESS:
-        print("❌ No pair address configured")
-        return {}
-        
-    data = {}
-    for name, url in axiom_endpoints.items():
+class UpstreamError(Exception):
+    pass
+
+def fetch_sources(jobs, deadline=TICK_DEADLINE):
+    # Run every upstream call of a tick concurrently. Whatever has arrived
+    # by the deadline is returned; failed or late sources come back as stale.
+    results = {}
+    stale = set()
+    threads = {}
+    done = eventlet.queue.LightQueue()
+    started = time.time()
+
+    def run(name, func, args):
+        begun = time.perf_counter()
         try:
-            print(f"🔍 Fetching Axiom {name} from {url}")
-            resp = requests.get(url, headers=axiom_headers, cookies=axiom_cookies, timeout=15)
-            print(f"✅ Axiom {name} status: {resp.status_code}")
-            
-            if resp.status_code == 200:
-                data[name] = resp.json()
-            else:
-                print(f"❌ Axiom {name} failed with status: {resp.status_code}")
-                data[name] = {}
+            value = func(*args)
+            outcome = "unchanged" if value is UNCHANGED else "ok"
+            done.put((name, True, value))
         except Exception as e:
-            print(f"❌ Error fetching Axiom {name}: {e}")
-            data[name] = {}
-    return data
+            outcome = "error"
+            done.put((name, False, e))
+        SOURCE_FETCH_SECONDS.labels(name, outcome).observe(time.perf_counter() - begun)
+
+    with eventlet.Timeout(deadline, False):
+        for name, (func, args) in jobs.items():
+            threads[name] = upstream_pool.spawn(run, name, func, args)
+        # Collect in completion order so one slow host cannot hide the others
+        for _ in range(len(jobs)):
+            name, ok, value = done.get()
+            if ok:
+                results[name] = value
+            else:
+                fetch_log.error(f"❌ Error fetching {name}: {value}")
+                stale.add(name)
+
+    for name in jobs:
+        if name not in results and name not in stale:
+            fetch_log.warning(f"⏱️ {name} missed the {deadline}s tick deadline")
+            SOURCE_FETCH_SECONDS.labels(name, "timeout").observe(time.time() - started)
+            stale.add(name)
+            gt = threads.get(name)
+            if gt:
+                gt.kill()
+
+    fetch_log.debug(f"⚡ Fetched {len(results)}/{len(jobs)} sources in {time.time() - started:.2f}s")
+    return results, stale
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    JSON_ERRORS = (ValueError,)
+
+def response_stream(resp):
+    # Decoded body as a file-like object, without buffering it whole
+    raw = getattr(resp, "raw", None)
+    if raw is not None and hasattr(raw, "read"):
+        raw.decode_content = True
+        return raw
+    return BytesIO(resp.content)
+
+class DigestReader:
+    # Hashes the bytes a parser pulls through it, so unchanged payloads
+    # are still detected when the body is never held in memory
+    def __init__(self, stream):
+        self.stream = stream
+        self.hash = hashlib.blake2b(digest_size=16)
+
+    def read(self, size=-1):
+        chunk = self.stream.read(size)
+        self.hash.update(chunk)
+        return chunk
+
+    def digest(self):
+        return self.hash.digest()
+
+# Timeline fields kept per entry, by path relative to the entry
+TIMELINE_PREFIX = "data.communityResults.result.ranked_community_timeline.timeline.instructions.item"
+TIMELINE_ENTRY_PREFIXES = (TIMELINE_PREFIX + ".entries.item", TIMELINE_PREFIX + ".entry")
+TWEET_RESULT = "content.itemContent.tweet_results.result."
+TWEET_USER = TWEET_RESULT + "core.user_results.result."
+TIMELINE_FIELDS = {
+    "content.cursorType": "cursorType",
+    "content.value": "cursor",
+    TWEET_RESULT + "__typename": "typename",
+    TWEET_RESULT + "rest_id": "tweet_id",
+    TWEET_RESULT + "legacy.full_text": "text",
+    TWEET_RESULT + "legacy.created_at": "created_at",
+    TWEET_RESULT + "legacy.retweet_count": "retweet_count",
+    TWEET_RESULT + "legacy.reply_count": "reply_count",
+    TWEET_RESULT + "legacy.favorite_count": "favorite_count",
+    TWEET_RESULT + "views.count": "views",
+    TWEET_USER + "core.name": "author_name",
+    TWEET_USER + "core.screen_name": "author_screen",
+    TWEET_USER + "legacy.followers_count": "followers_count",
+}
+TIMELINE_TWEET_KEYS = (
+    "tweet_id", "text", "created_at", "author_name", "author_screen", "followers_count",
+    "retweet_count", "reply_count", "favorite_count",
+)
+
+def stream_timeline(stream):
+    # Same result as parse_x_payload("timeline", ...) from parser events:
+    # only the declared scalars are kept, no document tree is built
+    tweets = []
+    cursor = None
+    entries = []
+    entry = None
+    entry_prefix = None
+    instruction_type = None
+    for prefix, event, value in ijson.parse(stream):
+        if entry is not None:
+            if prefix == entry_prefix and event == "end_map":
+                entries.append(entry)
+                entry = None
+            elif prefix.startswith(entry_prefix):
+                field = TIMELINE_FIELDS.get(prefix[len(entry_prefix) + 1:])
+                if field and event not in ("start_map", "end_map", "start_array", "end_array", "map_key"):
+                    entry[field] = value
+        elif prefix in TIMELINE_ENTRY_PREFIXES and event == "start_map":
+            entry = {}
+            entry_prefix = prefix
+        elif prefix == TIMELINE_PREFIX + ".type":
+            instruction_type = value
+        elif prefix == TIMELINE_PREFIX and event == "end_map":
+            if instruction_type in ("TimelineAddEntries", "TimelineReplaceEntry"):
+                for e in entries:
+                    if e.get("cursorType") == "Bottom":
+                        cursor = e.get("cursor")
+                    elif e.get("typename") == "Tweet":
+                        tweet = {key: e.get(key) for key in TIMELINE_TWEET_KEYS}
+                        tweet["views"] = e.get("views", "0")
+                        tweets.append(tweet)
+            entries = []
+            instruction_type = None
+    return {"tweets": tweets, "cursor": cursor}
+
+def source_get(url, source=None, stream=False, hedge=False):
+    # Conditional GET for a tracked source; None when nothing changed
+    resp = upstream.get(url, hedge=hedge, headers=source.validators() if source else None, stream=stream)
+    if source and not source.observe(resp, digest=not stream):
+        resp.close()
+        return None
+    return resp
+
+def fetch_axiom_source(name, url, source=None):
+    fetch_log.debug(f"🔍 Fetching Axiom {name} from {url}")
+    resp = source_get(url, source, hedge=True)
+    if resp is None:
+        fetch_log.debug(f"♻️ Axiom {name} unchanged")
+        return UNCHANGED
+    fetch_log.debug(f"✅ Axiom {name} status: {resp.status_code}")
+
+    if resp.status_code != 200:
+        raise UpstreamError(f"Axiom {name} failed with status: {resp.status_code}")
+    return resp.json()
+
+def fetch_axiom_data(axiom_endpoints):
+    if not axiom_endpoints:
+        fetch_log.error("❌ No pair address configured")
+        return {}
+        
+    jobs = {name: (fetch_axiom_source, (name, url)) for name, url in axiom_endpoints.items()}
+    results, _ = fetch_sources(jobs)
+    return {name: results.get(name, SOURCE_FALLBACKS.get(name, {})) for name in axiom_endpoints}
 
 def update_sol_price():
-    print("🚀 Starting SOL price updater...")
+    fetch_log.info("🚀 Starting SOL price updater...")
     while True:
         try:
-            print("🔍 Fetching SOL price...")
-            response = requests.get(COINGECKO_URL, timeout=10)
+            fetch_log.debug("🔍 Fetching SOL price...")
+            response = upstream.get(COINGECKO_URL, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 cached_sol_price["price"] = data['solana']['usd']
                 cached_sol_price["last_updated"] = time.time()
-                print(f"✅ Updated SOL price: ${cached_sol_price['price']}")
+                fetch_log.debug(f"✅ Updated SOL price: ${cached_sol_price['price']}")
             else:
-                print(f"❌ SOL price fetch failed: {response.status_code}")
+                fetch_log.error(f"❌ SOL price fetch failed: {response.status_code}")
         except Exception as e:
-            print(f"❌ Error updating SOL price: {e}")
+            fetch_log.error(f"❌ Error updating SOL price: {e}")
         time.sleep(PRICE_UPDATE_INTERVAL)
 
 def get_sol_usd_price():
     try:
-        resp = requests.get(COINGECKO_URL, timeout=10)
+        resp = upstream.get(COINGECKO_URL, timeout=10)
         if resp.status_code == 200:
             return resp.json().get("solana", {}).get("usd", 0)
     except Exception as e:
-        print(f"❌ Error fetching SOL price: {e}")
+        fetch_log.error(f"❌ Error fetching SOL price: {e}")
     return 0
 
-def fetch_x_data():
-    if not community_id:
-        print("❌ No community ID configured")
-        return {"timeline": [], "fetchOne": {}}
-        
-    data = {}
-    for name, url in x_urls.items():
-        try:
-            print(f"🔍 Fetching X {name}...")
-            resp = requests.get(url, headers=x_headers, timeout=15)
-            print(f"✅ X {name} status: {resp.status_code}")
-
-            if resp.status_code != 200:
-                print(f"❌ Non-200 response from {name}: {resp.status_code}")
-                data[name] = {"error": "non_200"}
-                continue
+def fetch_x_source(name, url, source=None):
+    fetch_log.debug(f"🔍 Fetching X {name}...")
+    resp = source_get(url, source, stream=True)
+    if resp is None:
+        fetch_log.debug(f"♻️ X {name} unchanged")
+        return UNCHANGED
 
-            # Handle compression
-            content = resp.content
-            encoding = resp.headers.get("Content-Encoding", "")
-
-            if encoding == "br":
-                try:
-                    content = brotli.decompress(content)
-                except Exception:
-                    content = resp.text.encode("utf-8")
-            elif encoding == "gzip":
-                try:
-                    content = gzip.GzipFile(fileobj=BytesIO(content)).read()
-                except Exception:
-                    content = resp.text.encode("utf-8")
+    try:
+        fetch_log.debug(f"✅ X {name} status: {resp.status_code}")
+        if resp.status_code != 200:
+            raise UpstreamError("non_200")
 
-            # Normalize content
-            if isinstance(content, bytes):
-                try:
-                    text = content.decode("utf-8")
-                except Exception:
-                    text = content.decode("utf-8", errors="ignore")
+        # The transport already undid gzip/br; read the decoded stream once
+        body = DigestReader(response_stream(resp))
+        try:
+            if name == "timeline" and IJSON_AVAILABLE:
+                parsed = stream_timeline(body)
             else:
-                text = str(content)
-
-            # Parse JSON
-            try:
-                raw = json.loads(text)
-            except Exception as e:
-                print(f"❌ Non-JSON response from {name}: {str(e)[:100]}")
-                data[name] = {"error": "not_json"}
-                continue
+                parsed = parse_x_payload(name, json.loads(body.read()))
+        except JSON_ERRORS as e:
+            fetch_log.error(f"❌ Non-JSON response from {name}: {str(e)[:100]}")
+            raise UpstreamError("not_json")
 
-            # Parse fetchOne
-            if name == "fetchOne":
-                community = raw.get("data", {}).get("communityResults", {}).get("result", {})
-                admin = community.get("admin_results", {}).get("result", {})
-                core = admin.get("core", {})
-                legacy = admin.get("legacy", {})
-                data[name] = {
-                    "id": community.get("id_str"),
-                    "name": community.get("name"),
-                    "description": community.get("description"),
-                    "member_count": community.get("member_count"),
-                    "admin": {
-                        "name": core.get("name"),
-                        "screen_name": core.get("screen_name"),
-                        "followers": legacy.get("followers_count"),
-                        "statuses": legacy.get("statuses_count"),
-                        "bio": legacy.get("description"),
-                    },
-                }
+        if source and source.same_payload(body.digest()):
+            fetch_log.debug(f"♻️ X {name} unchanged")
+            return UNCHANGED
+        return parsed
+    finally:
+        resp.close()
 
-            # Parse timeline
-            elif name == "timeline":
-                tweets = []
-                instructions = (
-                    raw.get("data", {})
-                       .get("communityResults", {})
-                       .get("result", {})
-                       .get("ranked_community_timeline", {})
-                       .get("timeline", {})
-                       .get("instructions", [])
-                )
-                for ins in instructions:
-                    if ins.get("type") != "TimelineAddEntries":
-                        continue
-                    for entry in ins.get("entries", []):
-                        tweet = (
-                            entry.get("content", {})
-                                 .get("itemContent", {})
-                                 .get("tweet_results", {})
-                                 .get("result", {})
-                        )
-                        if not tweet or tweet.get("__typename") != "Tweet":
-                            continue
-                        legacy = tweet.get("legacy", {})
-                        user = (
-                            tweet.get("core", {})
-                                 .get("user_results", {})
-                                 .get("result", {})
-                        )
-                        user_legacy = user.get("legacy", {})
-                        user_core = user.get("core", {})
-                        tweets.append({
-                            "tweet_id": tweet.get("rest_id"),
-                            "text": legacy.get("full_text"),
-                            "created_at": legacy.get("created_at"),
-                            "author_name": user_core.get("name"),
-                            "author_screen": user_core.get("screen_name"),
-                            "followers_count": user_legacy.get("followers_count"),
-                            "retweet_count": legacy.get("retweet_count"),
-                            "reply_count": legacy.get("reply_count"),
-                            "favorite_count": legacy.get("favorite_count"),
-                            "views": tweet.get("views", {}).get("count", "0"),
-                        })
-                data[name] = tweets
+def parse_x_payload(name, raw):
+    # Parse fetchOne
+    if name == "fetchOne":
+        community = raw.get("data", {}).get("communityResults", {}).get("result", {})
+        admin = community.get("admin_results", {}).get("result", {})
+        core = admin.get("core", {})
+        legacy = admin.get("legacy", {})
+        return {
+            "id": community.get("id_str"),
+            "name": community.get("name"),
+            "description": community.get("description"),
+            "member_count": community.get("member_count"),
+            "admin": {
+                "name": core.get("name"),
+                "screen_name": core.get("screen_name"),
+                "followers": legacy.get("followers_count"),
+                "statuses": legacy.get("statuses_count"),
+                "bio": legacy.get("description"),
+            },
+        }
 
+    # Parse timeline
+    elif name == "timeline":
+        tweets = []
+        cursor = None
+        instructions = (
+            raw.get("data", {})
+               .get("communityResults", {})
+               .get("result", {})
+               .get("ranked_community_timeline", {})
+               .get("timeline", {})
+               .get("instructions", [])
+        )
+        for ins in instructions:
+            if ins.get("type") == "TimelineAddEntries":
+                entries = ins.get("entries", [])
+            elif ins.get("type") == "TimelineReplaceEntry":
+                entries = [ins.get("entry", {})]
             else:
-                data[name] = raw
+                continue
+            for entry in entries:
+                content = entry.get("content", {})
+                if content.get("cursorType") == "Bottom":
+                    cursor = content.get("value")
+                    continue
+                tweet = (
+                    entry.get("content", {})
+                         .get("itemContent", {})
+                         .get("tweet_results", {})
+                         .get("result", {})
+                )
+                if not tweet or tweet.get("__typename") != "Tweet":
+                    continue
+                legacy = tweet.get("legacy", {})
+                user = (
+                    tweet.get("core", {})
+                         .get("user_results", {})
+                         .get("result", {})
+                )
+                user_legacy = user.get("legacy", {})
+                user_core = user.get("core", {})
+                tweets.append({
+                    "tweet_id": tweet.get("rest_id"),
+                    "text": legacy.get("full_text"),
+                    "created_at": legacy.get("created_at"),
+                    "author_name": user_core.get("name"),
+                    "author_screen": user_core.get("screen_name"),
+                    "followers_count": user_legacy.get("followers_count"),
+                    "retweet_count": legacy.get("retweet_count"),
+                    "reply_count": legacy.get("reply_count"),
+                    "favorite_count": legacy.get("favorite_count"),
+                    "views": tweet.get("views", {}).get("count", "0"),
+                })
+        return {"tweets": tweets, "cursor": cursor}
 
-        except Exception as e:
-            print(f"❌ Error fetching X {name}: {e}")
-            data[name] = {"error": str(e)}
+    else:
+        return raw
 
-    return data
+def fetch_x_data(x_urls):
+    if not x_urls:
+        fetch_log.error("❌ No community ID configured")
+        return {"timeline": SOURCE_FALLBACKS["timeline"], "fetchOne": {}}
+        
+    jobs = {name: (fetch_x_source, (name, url)) for name, url in x_urls.items()}
+    results, _ = fetch_sources(jobs)
+    return {name: results.get(name, SOURCE_FALLBACKS.get(name, {})) for name in x_urls}
 
-def categorize_wallet_age(funded_at):
-    if not funded_at:
-        return "unknown"
-    
+def backfill_tweets(store, timeline_url):
+    # Walk the timeline's Bottom cursors until a page brings nothing new
     try:
-        funded_date = datetime.fromisoformat(funded_at.replace('Z', '+00:00'))
-        current_date = datetime.now(funded_date.tzinfo)
-        age_days = (current_date - funded_date).days
-        
-        if age_days <= 30:
-            return "baby"
-        elif age_days <= 180:
-            return "adult"
-        else:
-            return "old"
-    except:
-        return "unknown"
+        while store.cursor and store.backfilled_pages < TWEET_BACKFILL_PAGES:
+            time.sleep(TWEET_BACKFILL_DELAY)
+            page = fetch_x_source("timeline", timeline_page_url(timeline_url, store.cursor))
+            added, updated = store.upsert(page["tweets"])
+            store.backfilled_pages += 1
+            fetch_log.info(f"🧵 Backfilled timeline page {store.backfilled_pages}: +{added} new, {updated} updated, {len(store)} stored")
+            next_cursor = page["cursor"]
+            store.cursor = next_cursor if added and next_cursor != store.cursor else None
+    except Exception as e:
+        fetch_log.error(f"❌ Timeline backfill stopped: {e}")
+    finally:
+        store.backfilling = False
 
-def fetch_all_data():
-    print("🔄 Starting data fetch cycle...")
+def fetch_all_data(pair):
+    fetch_log.debug(f"🔄 Starting data fetch cycle for {pair.pair_address}...")
     
-    if not PAIR_ADDRESS or not community_id:
-        print("❌ Configuration not complete. Skipping fetch.")
+    if not pair.pair_address or not pair.community_id:
+        fetch_log.warning("❌ Configuration not complete. Skipping fetch.")
         return None
         
     try:
-        print("📡 Fetching Axiom data...")
-        axiom_data = fetch_axiom_data()
-        print("📡 Fetching X data...")
-        x_data = fetch_x_data()
-        
-        # Process timeline data
-        timeline = x_data.get("timeline", [])
-        unique_authors = set()
-        author_followers = []
-        
-        for item in timeline:
-            author = item.get("author_screen")
-            followers = item.get("followers_count", 0)
-            if author and author not in unique_authors:
-                unique_authors.add(author)
-                author_followers.append({
-                    "author": author,
-                    "followers": followers,
-                    "author_name": item.get("author_name", "")
-                })
+        mark = time.perf_counter()
+        # Fan out the upstream calls of the sources due this tick at once
+        now = upstream_now()
+        base = pair.fetch_interval
+        jobs = {}
+        down = set()
+        for name, url in pair.source_urls().items():
+            source = pair.source(name)
+            # A source whose hosts all have an open circuit is not
+            # attempted; it keeps its last value and is reported stale
+            is_x = name in pair.x_urls
+            if not upstream.available(url, hedge=not is_x):
+                down.add(name)
+                continue
+            if not source.is_due(now, base):
+                continue
+            jobs[name] = (fetch_x_source if is_x else fetch_axiom_source, (name, url, source))
+        fetch_log.debug(f"📡 Fetching {len(jobs)} due sources: {', '.join(jobs) or 'none'}")
+        if down:
+            fetch_log.warning(f"🚧 Skipping sources behind open circuits: {', '.join(sorted(down))}")
+        results, failed = fetch_sources(jobs)
+
+        now = upstream_now()
+        changed = set()
+        for name in jobs:
+            if name in failed:
+                pair.source(name).failed(now, base)
+            else:
+                pair.source(name).record(results[name], now, base)
+                if results[name] is not UNCHANGED:
+                    changed.add(name)
+        # Stale until the source answers again: failed this tick, still
+        # backing off from an earlier failure, or behind an open circuit
+        stale_sources = down | {name for name in pair.source_urls() if pair.source(name).failures}
+        mark = observe_phase("fetch", mark)
+
+        # Nothing new upstream: keep the current snapshot instead of
+        # re-deriving and re-broadcasting an identical one. Wallets that
+        # aged into another bucket count as a change.
+        aged = pair.wallets.advance(now)
+        latest = pair.storage.get_latest()
+        if (
+            latest and not changed and not aged
+            and sorted(stale_sources) == latest.get("staleSources")
+            and latest.get("axiom", {}).get("solPriceUSD") == cached_sol_price["price"]
+        ):
+            fetch_log.debug(f"♻️ No source changed for {pair.pair_address}, skipping tick")
+            # The series still gets a carried-forward point; only the
+            # broadcast and the disk write are skipped
+            values = series_values(latest)
+            pair.extrema.update(now, values["marketCapUSD"])
+            values.update(pair.indicators.update(now, values))
+            if pair.storage.carry_forward(now, values):
+                if history_db:
+                    history_db.enqueue_point(pair.pair_address, now, values)
+                if snapshot_publisher:
+                    snapshot_publisher.publish(point_message(pair, now, values))
+            TICKS.labels("skipped").inc()
+            return latest
+
+        def source_value(name):
+            # Stale sources carry their last good value forward
+            value = pair.source(name).value
+            if value is None:
+                return SOURCE_FALLBACKS.get(name, {})
+            return value
+
+        axiom_data = {name: source_value(name) for name in pair.axiom_endpoints}
+        x_data = {name: source_value(name) for name in pair.x_urls}
         
+        # Upsert the newest timeline page; older pages are backfilled
+        # from its cursor in the background
+        if "timeline" in changed:
+            added, updated = pair.tweets.ingest_head(x_data["timeline"], now)
+            fetch_log.debug(f"🐦 Tweet store: +{added} new, {updated} updated, {len(pair.tweets)} stored")
+            if pair.tweets.wants_backfill():
+                pair.tweets.backfilling = True
+                eventlet.spawn_n(backfill_tweets, pair.tweets, pair.x_urls["timeline"])
+        x_data["timeline"] = pair.tweets.head_tweets()
+
+        # Authors and social totals cover every stored tweet
+        unique_authors = pair.tweets.authors
+        author_followers = pair.tweets.author_followers()
+        social = {
+            **pair.tweets.social_totals(),
+            "memberCount": x_data.get("fetchOne", {}).get("member_count") or 0,
+        }
+
         # Process wallet data
         holders_info = []
         wallet_age_counts = {"baby": 0, "adult": 0, "old": 0}
+        wallet_age_stats = None
         total_holders_count = 0
         
         try:
-            holder_url = f"https://api6.axiom.trade/holder-data-v3?pairAddress={PAIR_ADDRESS}&onlyTrackedWallets=false"
-            print(f"🔍 Fetching holder data from {holder_url}")
-            holder_resp = requests.get(holder_url, headers=axiom_headers, cookies=axiom_cookies, timeout=15)
-            
-            if holder_resp.status_code == 200:
-                holder_json = holder_resp.json()
-                print(f"✅ Holder data received: {len(holder_json) if isinstance(holder_json, list) else 1} entries")
-
-                if isinstance(holder_json, dict):
-                    holder_json = [holder_json]
-
-                if isinstance(holder_json, list):
-                    seen_wallets = set()
-                    for h in holder_json:
-                        if not h or not isinstance(h, dict):
-                            continue
-                        wallet = h.get("walletAddress")
-                        if not wallet or wallet in seen_wallets:
-                            continue
-                        seen_wallets.add(wallet)
-
-                        funded_at = None
-                        wf = h.get("walletFunding")
-                        if isinstance(wf, dict):
-                            funded_at = wf.get("fundedAt")
-                        
-                        age_category = categorize_wallet_age(funded_at)
-                        wallet_age_counts[age_category] += 1
-                        
-                        holders_info.append({
-                            "walletAddress": wallet,
-                            "fundedAt": funded_at,
-                            "ageCategory": age_category
-                        })
-
-                    token_info = axiom_data.get("token_info", {})
-                    total_holders_count = token_info.get("numHolders", len(holder_json))
-                    print(f"📊 Wallet stats: {len(holder_json)} wallets, {total_holders_count} total holders")
-            else:
-                print(f"❌ Holder data fetch failed: {holder_resp.status_code}")
-                
+            holder_json = pair.source("holders").value
+            if holder_json is None:
+                raise UpstreamError("no holder data yet")
+
+            if isinstance(holder_json, dict):
+                holder_json = [holder_json]
+
+            if isinstance(holder_json, list):
+                if "holders" in changed:
+                    fetch_log.debug(f"✅ Holder data received: {len(holder_json)} entries")
+                    joined, left = pair.wallets.update(holder_json, now)
+                else:
+                    joined, left = 0, 0
+                    pair.wallets.advance(now)
+                holders_info = pair.wallets.holders
+                wallet_age_counts = pair.wallets.age_counts()
+                wallet_age_stats = pair.wallets.stats(now)
+                fetch_log.debug(f"👛 Wallet index: {len(pair.wallets)} wallets (+{joined} / -{left})")
+
+                token_info = axiom_data.get("token_info", {})
+                total_holders_count = token_info.get("numHolders", len(holder_json))
+                fetch_log.debug(f"📊 Wallet stats: {len(holder_json)} wallets, {total_holders_count} total holders")
+
         except Exception as e:
-            print(f"❌ Error fetching holders: {e}")
+            fetch_log.error(f"❌ Error fetching holders: {e}")
             token_info = axiom_data.get("token_info", {})
             total_holders_count = token_info.get("numHolders", 0)
             if total_holders_count > 0:
@@ -458,6 +3541,8 @@ def fetch_all_data():
                     "old": max(1, int(total_holders_count * 0.3))
                 }
 
+        mark = observe_phase("holders", mark)
+
         # Process main data
         pair_info = axiom_data.get("pair_info", {})
         token_info = axiom_data.get("token_info", {})
@@ -466,18 +3551,15 @@ def fetch_all_data():
         first_stats = pair_stats[0] if pair_stats else {}
         sol_price_usd = cached_sol_price["price"]
         
-        # Calculate fib levels
+        # Calculate fib levels from the running high of the earlier samples
         fib62 = 0
         fib50 = 0
-        min_mc = 5750
+        min_mc = FIB_FLOOR_MC
         max_mc = min_mc
 
-        all_data = data_storage.get_all()
-        if all_data:
-            for entry in all_data:
-                mc = entry.get("axiom", {}).get("marketCapUSD", 0)
-                if mc > max_mc:
-                    max_mc = mc
+        if pair.extrema.count:
+            if pair.extrema.all_high > max_mc:
+                max_mc = pair.extrema.all_high
 
             fib62 = min_mc + 0.62 * (max_mc - min_mc)
             fib50 = min_mc + 0.50 * (max_mc - min_mc)
@@ -488,8 +3570,11 @@ def fetch_all_data():
         bundlers_hold_percent = token_holders.get("bundlersHoldPercent", 0) 
         snipers_hold_percent = token_holders.get("snipersHoldPercent", 0) 
         
+        sampled_at = datetime.fromtimestamp(now)
         result = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": sampled_at.isoformat(),
+            "pairAddress": pair.pair_address,
+            "communityId": pair.community_id,
             "axiom": {
                 "tokenAddress": pair_info.get("tokenAddress"),
                 "tokenName": pair_info.get("tokenName"),
@@ -519,6 +3604,7 @@ def fetch_all_data():
                 "priceLastUpdated": cached_sol_price["last_updated"],
                 "holders": holders_info,
                 "walletAgeCounts": wallet_age_counts,
+                "walletAgeStats": wallet_age_stats,
                 "totalHolders": total_holders_count,
                 "top10HoldersPercent": top10_holders_percent,
                 "insidersHoldPercent": insiders_hold_percent,
@@ -526,70 +3612,300 @@ def fetch_all_data():
                 "snipersHoldPercent": snipers_hold_percent
             },
             "x_data": x_data,
+            "social": social,
             "unique_authors": len(unique_authors),
-            "author_followers": author_followers
+            "author_followers": author_followers,
+            "staleSources": sorted(stale_sources)
         }
 
-        # Save to storage
-        data_storage.save(result)
-        print(f"✅ Data saved at {result['timestamp']}")
-        print(f"📊 Market Cap: ${result['axiom'].get('marketCapUSD', 0):,.2f}")
-        print(f"👥 Holders: {result['axiom'].get('numHolders', 0)}")
-        print(f"🐦 Unique Authors: {len(unique_authors)}")
+        # Track extrema with this sample and attach the windowed fib levels
+        pair.extrema.update(sampled_at.timestamp(), result["axiom"]["marketCapUSD"])
+        result["axiom"]["fibLevels"] = pair.extrema.fib_levels(sampled_at.timestamp())
+        result["indicators"] = pair.indicators.update(sampled_at.timestamp(), series_values(result))
+        mark = observe_phase("build", mark)
+
+        # Save to storage; the disk write happens on the history writer thread
+        pair.storage.save(result)
+        if history_db:
+            history_db.enqueue(pair.pair_address, result)
+        if snapshot_publisher:
+            snapshot_publisher.publish(snapshot_message(pair, result))
+        mark = observe_phase("save", mark)
+        fetch_log.info(
+            f"✅ {pair.pair_address} saved at {result['timestamp']}: "
+            f"MC ${result['axiom'].get('marketCapUSD') or 0:,.2f}, "
+            f"{result['axiom'].get('numHolders') or 0} holders, {len(unique_authors)} authors"
+        )
 
-        # Emit via Socket.IO
-        socketio.emit('data_update', result)
+        # Emit via Socket.IO to the clients watching this pair
+        broadcast_snapshot(pair, result)
+        observe_phase("emit", mark)
+        TICKS.labels("saved").inc()
         return result
 
     except Exception as e:
-        print(f"❌ Error in fetch_all_data: {e}")
-        import traceback
-        traceback.print_exc()
+        TICKS.labels("error").inc()
+        fetch_log.exception(f"❌ Error in fetch_all_data: {e}")
         return None
 
 def background_fetcher():
-    print("🚀 Starting background fetcher thread...")
+    fetch_log.info("🚀 Starting background fetcher thread...")
     global is_fetching
     
     # Wait a bit for configuration
     time.sleep(2)
     
     while True:
+        delay = fetch_interval
         try:
-            if PAIR_ADDRESS and community_id:
+            pairs = pair_registry.all()
+            if pairs:
                 if not is_fetching:
                     is_fetching = True
-                    print("🎯 Starting data fetching (configuration detected)")
+                    fetch_log.info("🎯 Starting data fetching (configuration detected)")
                 
-                result = fetch_all_data()
-                if result:
-                    print("✅ Background fetch successful")
-                else:
-                    print("❌ Background fetch returned None")
+                now = time.time()
+                for pair in pairs:
+                    if pair.is_due(now):
+                        pair.in_flight = True
+                        fetch_pool.spawn_n(run_pair_fetch, pair)
+                delay = pair_registry.seconds_until_next_due(time.time())
             else:
                 if is_fetching:
                     is_fetching = False
-                    print("⏳ Waiting for configuration...")
+                    fetch_log.debug("⏳ Waiting for configuration...")
                 else:
-                    print("⏳ No configuration yet...")
+                    fetch_log.debug("⏳ No configuration yet...")
                 
         except Exception as e:
-            print(f"❌ Error in background_fetcher: {e}")
-            import traceback
-            traceback.print_exc()
+            fetch_log.exception(f"❌ Error in background_fetcher: {e}")
         
-        time.sleep(fetch_interval)
+        time.sleep(delay)
+
+def replay_fetcher():
+    # Steps the virtual clock by the shortest fetch interval and ticks
+    # every tracked pair once per step, until the recording runs out
+    fetch_log.info("⏯️ Starting replay fetcher...")
+    while not upstream_replay.finished:
+        started = time.time()
+        pairs = pair_registry.all()
+        if not pairs:
+            time.sleep(1)
+            continue
+        step = min(p.fetch_interval for p in pairs)
+        upstream_replay.advance(upstream_replay.now() + step)
+        try:
+            price = upstream_replay.get(COINGECKO_URL).json()["solana"]["usd"]
+            cached_sol_price["price"] = price
+            cached_sol_price["last_updated"] = upstream_replay.now()
+        except (ReplayError, KeyError, ValueError):
+            pass
+        for pair in pairs:
+            pair.in_flight = True
+            fetch_pool.spawn_n(run_pair_fetch, pair)
+        fetch_pool.waitall()
+        if REPLAY_SPEED > 0:
+            time.sleep(max(0, step / REPLAY_SPEED - (time.time() - started)))
+    fetch_log.info(f"⏹️ Replay finished at {datetime.fromtimestamp(upstream_replay.now()).isoformat()}")
+
+def run_pair_fetch(pair):
+    try:
+        with TICK_SECONDS.time():
+            result = fetch_all_data(pair)
+        if result:
+            fetch_log.debug(f"✅ Background fetch successful for {pair.pair_address}")
+        else:
+            fetch_log.warning(f"❌ Background fetch returned None for {pair.pair_address}")
+    finally:
+        pair.in_flight = False
+        pair.schedule_next()
+        publish_pair_state(pair)
 
 # -------------------------
 # API ROUTES
 # -------------------------
-def get_latest_data():
-    return data_storage.get_latest()
+def get_request_pair():
+    pair_address = request.args.get("pair")
+    pair = pair_registry.get(pair_address)
+    if not pair and pair_address:
+        raise PairNotFound(pair_address)
+    return pair
+
+def get_request_storage():
+    pair = get_request_pair()
+    return pair.storage if pair else empty_storage
+
+def parse_time_arg(name):
+    # Accepts epoch seconds or an ISO timestamp
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        raise InvalidArgument(f"{name} must be epoch seconds or an ISO timestamp")
+
+HISTORY_PAGE_ARGS = ("from", "to", "limit", "cursor", "points", "downsample")
+DEFAULT_HISTORY_LIMIT = int(os.environ.get("DEFAULT_HISTORY_LIMIT", 1000))
+
+def int_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise InvalidArgument(f"{name} must be a positive integer")
+    return number
+
+def history_query(default_limit, always=False):
+    # Paging/downsampling arguments, or None for a route's default window
+    if not always and not any(request.args.get(name) for name in HISTORY_PAGE_ARGS):
+        return None
+    points = int_arg("points")
+    method = request.args.get("downsample", "lttb")
+    if method not in DOWNSAMPLERS:
+        raise InvalidArgument(f"downsample must be one of: {', '.join(DOWNSAMPLERS)}")
+    limit = int_arg("limit") or (HISTORY_QUERY_LIMIT if points else default_limit)
+    return {
+        "start": parse_time_arg("from"),
+        "end": parse_time_arg("to"),
+        "cursor": parse_time_arg("cursor"),
+        "limit": min(limit, HISTORY_QUERY_LIMIT),
+        "points": points,
+        "method": method,
+    }
+
+def history_page(storage, query, primary):
+    # Newest `limit` samples within [from, to] older than the cursor, oldest
+    # first. The ring buffer serves what it holds and only older samples come
+    # from disk; the returned cursor pages further back in time.
+    start, end, cursor, limit = query["start"], query["end"], query["cursor"], query["limit"]
+
+    view = storage.between(start, end)
+    if cursor is not None:
+        stop = int(np.searchsorted(view["ts"], cursor, side="left"))
+        view = {name: column[:stop] for name, column in view.items()}
+
+    ts = storage.window()["ts"]
+    in_memory = len(ts) and start is not None and start >= ts[0]
+    if in_memory or len(view["ts"]) > limit or history_db is None or not storage.pair_address:
+        has_more = len(view["ts"]) > limit
+        if has_more:
+            view = {name: column[len(column) - limit:] for name, column in view.items()}
+        lists = storage.lists(view)
+    else:
+        lists = storage.lists(view)
+        before = lists["ts"][0] if lists["ts"] else cursor
+        older = history_db.query(storage.pair_address, start, end, limit=limit - len(lists["ts"]) + 1, newest=True, before=before)
+        lists = {name: older[name] + values for name, values in lists.items()}
+        has_more = len(lists["ts"]) > limit
+        if has_more:
+            lists = {name: values[len(values) - limit:] for name, values in lists.items()}
+
+    next_cursor = lists["ts"][0] if has_more and lists["ts"] else None
+
+    points = query["points"]
+    if points and len(lists["ts"]) > points:
+        picks = DOWNSAMPLERS[query["method"]](
+            np.asarray(lists["ts"], dtype=np.float64),
+            np.asarray(lists[primary], dtype=np.float64),
+            points,
+        )
+        lists = {name: [values[i] for i in picks] for name, values in lists.items()}
+    return lists, next_cursor
+
+def chart_history(storage, view, query):
+    if query is None:
+        return storage.view(view), None
+    lists, next_cursor = history_page(storage, query, CHART_PRIMARY[view])
+    return chart_rows(lists, CHART_VIEWS[view][1]), next_cursor
+
+def get_latest_data(pair_address=None):
+    pair = pair_registry.get(pair_address)
+    return pair.storage.get_latest() if pair else {}
+
+LONG_POLL_TIMEOUT = float(os.environ.get("LONG_POLL_TIMEOUT", 25))
+
+# Response headers cached alongside a body
+CACHED_HEADERS = ("X-Next-Cursor",)
+
+# Bodies at least this large are served precompressed, built once per
+# version and encoding and picked by Accept-Encoding
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 5))
+COMPRESSORS = {
+    "br": lambda body: brotli.compress(body, quality=BROTLI_QUALITY),
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL),
+}
+
+def response_encoding(body):
+    if len(body) < COMPRESS_MIN_BYTES:
+        return None
+    return request.accept_encodings.best_match(list(COMPRESSORS))
+
+def versioned_snapshot(view):
+    # Snapshot routes only change when a new version is saved: bodies are
+    # cached per (route, args, version), If-None-Match gets a 304 and
+    # ?since=<version> long-polls until a newer version exists.
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        storage = get_request_storage()
+
+        since = request.args.get("since", type=int)
+        if since is not None and not storage.wait_for_version(since, LONG_POLL_TIMEOUT):
+            return not_modified(storage)
+
+        version = storage.version
+        etag = f"{storage.token}-{version}"
+        if any(request.if_none_match.contains(f"{etag}-{e}" if e else etag) for e in (None, *COMPRESSORS)):
+            return not_modified(storage)
+
+        key = (request.path, tuple(sorted((k, v) for k, v in request.args.items(multi=True) if k != "since")))
+        cached = storage.cached_response(key)
+        if cached is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            cached = {"body": response.get_data(), "headers": headers, "variants": {}}
+            storage.cache_response(key, version, cached)
+
+        body = cached["body"]
+        encoding = response_encoding(body)
+        if encoding:
+            if encoding not in cached["variants"]:
+                cached["variants"][encoding] = COMPRESSORS[encoding](body)
+            body = cached["variants"][encoding]
+            etag = f"{etag}-{encoding}"
+        response = app.response_class(body, mimetype="application/json", headers=cached["headers"])
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag)
+        response.headers["X-Snapshot-Version"] = str(version)
+        return response
+    return wrapper
+
+def not_modified(storage):
+    response = app.response_class(status=304)
+    response.set_etag(f"{storage.token}-{storage.version}")
+    response.headers["X-Snapshot-Version"] = str(storage.version)
+    return response
 
 @app.route("/api/data")
+@versioned_snapshot
 def latest_data():
+    storage = get_request_storage()
     try:
-        latest = data_storage.get_latest()
+        latest = storage.get_latest()
         if latest:
             return jsonify(latest)
         return jsonify({"error": "No data available", "timestamp": datetime.now().isoformat()})
@@ -597,29 +3913,25 @@ def latest_data():
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/history")
+@versioned_snapshot
 def history_data():
-    return jsonify(data_storage.get_all())
+    storage = get_request_storage()
+    query = history_query(DEFAULT_HISTORY_LIMIT, always=True)
+    lists, next_cursor = history_page(storage, query, CHART_PRIMARY["history"])
+    response = jsonify(series_rows(lists))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return response
 
 @app.route("/api/marketcap")
+@versioned_snapshot
 def marketcap_data():
+    storage = get_request_storage()
+    query = history_query(CHART_VIEWS["marketcap"][0])
     try:
-        all_data = data_storage.get_all()
-        history_data = []
-        
-        for data in all_data[-100:]:
-            try:
-                timestamp = datetime.fromisoformat(data["timestamp"])
-                history_data.append({
-                    "timestamp": timestamp.isoformat(),
-                    "time": timestamp.strftime("%H:%M"),
-                    "marketCapUSD": data.get("axiom", {}).get("marketCapUSD", 0),
-                    "marketCapSol": data.get("axiom", {}).get("marketCapSol", 0),
-                    "volumeUSD": data.get("axiom", {}).get("volumeUSD", 0),
-                })
-            except:
-                continue
+        history_data, next_cursor = chart_history(storage, "marketcap", query)
 
-        latest_data = get_latest_data()
+        latest_data = storage.get_latest()
         current_mc = latest_data.get("axiom", {}).get("marketCapUSD", 0)
         
         return jsonify({
@@ -629,15 +3941,44 @@ def marketcap_data():
                 "volumeUSD": latest_data.get("axiom", {}).get("volumeUSD", 0),
                 "lastUpdated": latest_data.get("timestamp", "")
             },
-            "history": history_data
+            "history": history_data,
+            "nextCursor": next_cursor
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/indicators")
+@versioned_snapshot
+def indicators_data():
+    storage = get_request_storage()
+    query = history_query(CHART_VIEWS["indicators"][0])
+    try:
+        history_data, next_cursor = chart_history(storage, "indicators", query)
+
+        latest_data = storage.get_latest()
+
+        return jsonify({
+            "current": {
+                **latest_data.get("indicators", {}),
+                "lastUpdated": latest_data.get("timestamp", "")
+            },
+            "windows": {
+                "ema": INDICATOR_EMA,
+                "sma": INDICATOR_SMA,
+                "rates": INDICATOR_WINDOWS
+            },
+            "history": history_data,
+            "nextCursor": next_cursor
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/tokeninfo")
+@versioned_snapshot
 def token_info_data():
+    storage = get_request_storage()
     try:
-        latest_data = get_latest_data()
+        latest_data = storage.get_latest()
         axiom_data = latest_data.get("axiom", {})
         
         return jsonify({
@@ -652,27 +3993,14 @@ def token_info_data():
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/buys-sells")
+@versioned_snapshot
 def buys_sells_data():
+    storage = get_request_storage()
+    query = history_query(CHART_VIEWS["buys-sells"][0])
     try:
-        all_data = data_storage.get_all()
-        history_data = []
-        
-        for data in all_data[-50:]:
-            try:
-                timestamp = datetime.fromisoformat(data["timestamp"])
-                history_data.append({
-                    "timestamp": timestamp.isoformat(),
-                    "time": timestamp.strftime("%H:%M"),
-                    "buyVolume": data.get("axiom", {}).get("buyVolumeUSD", 0),
-                    "sellVolume": data.get("axiom", {}).get("sellVolumeUSD", 0),
-                    "netVolume": data.get("axiom", {}).get("volumeUSD", 0),
-                    "buyCount": data.get("axiom", {}).get("buyCount", 0),
-                    "sellCount": data.get("axiom", {}).get("sellCount", 0)
-                })
-            except:
-                continue
+        history_data, next_cursor = chart_history(storage, "buys-sells", query)
 
-        latest_data = get_latest_data()
+        latest_data = storage.get_latest()
         
         return jsonify({
             "current": {
@@ -683,20 +4011,24 @@ def buys_sells_data():
                 "sellCount": latest_data.get("axiom", {}).get("sellCount", 0),
                 "lastUpdated": latest_data.get("timestamp", "")
             },
-            "history": history_data
+            "history": history_data,
+            "nextCursor": next_cursor
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/wallet-age")
+@versioned_snapshot
 def wallet_age_data():
+    storage = get_request_storage()
     try:
-        latest_data = get_latest_data()
+        latest_data = storage.get_latest()
         wallet_age = latest_data.get("axiom", {}).get("walletAgeCounts", {})
         holders_data = latest_data.get("axiom", {}).get("holders", [])
         
         return jsonify({
             "distribution": wallet_age,
+            "stats": latest_data.get("axiom", {}).get("walletAgeStats"),
             "totalHolders": latest_data.get("axiom", {}).get("totalHolders", 0),
             "holders": holders_data[:50],
             "lastUpdated": latest_data.get("timestamp", "")
@@ -705,60 +4037,38 @@ def wallet_age_data():
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/social")
+@versioned_snapshot
 def social_data():
+    storage = get_request_storage()
+    query = history_query(CHART_VIEWS["social"][0])
     try:
-        all_data = data_storage.get_all()
-        history_data = []
-        
-        for data in all_data[-50:]:
-            try:
-                timestamp = datetime.fromisoformat(data["timestamp"])
-                timeline = data.get("x_data", {}).get("timeline", [])
-                
-                total_views = sum(int(t.get("views", 0)) for t in timeline if t.get("views"))
-                total_likes = sum(t.get("favorite_count", 0) for t in timeline)
-                total_retweets = sum(t.get("retweet_count", 0) for t in timeline)
-                total_replies = sum(t.get("reply_count", 0) for t in timeline)
-                
-                history_data.append({
-                    "timestamp": timestamp.isoformat(),
-                    "time": timestamp.strftime("%H:%M"),
-                    "views": total_views,
-                    "likes": total_likes,
-                    "retweets": total_retweets,
-                    "replies": total_replies,
-                    "uniqueAuthors": data.get("unique_authors", 0)
-                })
-            except:
-                continue
+        history_data, next_cursor = chart_history(storage, "social", query)
 
-        latest_data = get_latest_data()
-        timeline = latest_data.get("x_data", {}).get("timeline", [])
-        
-        current_views = sum(int(t.get("views", 0)) for t in timeline if t.get("views"))
-        current_likes = sum(t.get("favorite_count", 0) for t in timeline)
-        current_retweets = sum(t.get("retweet_count", 0) for t in timeline)
-        current_replies = sum(t.get("reply_count", 0) for t in timeline)
+        latest_data = storage.get_latest()
+        social = latest_data.get("social", {})
         
         return jsonify({
             "current": {
-                "views": current_views,
-                "likes": current_likes,
-                "retweets": current_retweets,
-                "replies": current_replies,
+                "views": social.get("views", 0),
+                "likes": social.get("likes", 0),
+                "retweets": social.get("retweets", 0),
+                "replies": social.get("replies", 0),
                 "uniqueAuthors": latest_data.get("unique_authors", 0),
                 "memberCount": latest_data.get("x_data", {}).get("fetchOne", {}).get("member_count", 0),
                 "lastUpdated": latest_data.get("timestamp", "")
             },
-            "history": history_data
+            "history": history_data,
+            "nextCursor": next_cursor
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/metrics")
+@versioned_snapshot
 def metrics_data():
+    storage = get_request_storage()
     try:
-        latest_data = get_latest_data()
+        latest_data = storage.get_latest()
         axiom_data = latest_data.get("axiom", {})
         x_data = latest_data.get("x_data", {})
         
@@ -775,25 +4085,31 @@ def metrics_data():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/fib-levels")
+@versioned_snapshot
+def fib_levels_data():
+    storage = get_request_storage()
+    try:
+        latest_data = storage.get_latest()
+        axiom_data = latest_data.get("axiom", {})
+
+        return jsonify({
+            "fibLevel62": axiom_data.get("fibLevel62", 0),
+            "fibLevel50": axiom_data.get("fibLevel50", 0),
+            "windows": axiom_data.get("fibLevels", {}),
+            "lastUpdated": latest_data.get("timestamp", "")
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/api/holders")
+@versioned_snapshot
 def holders_data():
+    storage = get_request_storage()
+    query = history_query(CHART_VIEWS["holders"][0])
     try:
-        latest_data = get_latest_data()
-        all_data = data_storage.get_all()
-        history_data = []
-        
-        for data in all_data[-100:]:
-            try:
-                timestamp = datetime.fromisoformat(data["timestamp"])
-                history_data.append({
-                    "timestamp": timestamp.isoformat(),
-                    "time": timestamp.strftime("%H:%M"),
-                    "value": data.get("axiom", {}).get("numHolders", 0),
-                    "marketCap": data.get("axiom", {}).get("marketCapUSD", 0),
-                    "uniqueAuthors": data.get("unique_authors", 0),
-                })
-            except Exception as e:
-                continue
+        latest_data = storage.get_latest()
+        history_data, next_cursor = chart_history(storage, "holders", query)
 
         current_holders = latest_data.get("axiom", {}).get("numHolders", 0)
         wallet_age_data = latest_data.get("axiom", {}).get("walletAgeCounts", {})
@@ -816,88 +4132,85 @@ def holders_data():
                 "totalHolders": latest_data.get("axiom", {}).get("totalHolders", 0)
             },
             "history": history_data,
+            "nextCursor": next_cursor,
         })
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/tweets")
+def tweets_data():
+    pair = get_request_pair()
+    limit = min(int_arg("limit") or 100, TWEET_STORE_LIMIT)
+    if not pair:
+        return jsonify({"tweets": [], "store": TweetStore().stats()})
+    try:
+        return jsonify({
+            "tweets": pair.tweets.newest(limit),
+            "totals": pair.tweets.social_totals(),
+            "store": pair.tweets.stats(),
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/tweets/<tweet_id>/series")
+def tweet_series_data(tweet_id):
+    pair = get_request_pair()
+    if not pair or tweet_id not in pair.tweets.tweets:
+        return jsonify({"error": f"Tweet {tweet_id} is not tracked"}), 404
+    return jsonify({
+        "tweet": pair.tweets.tweets[tweet_id],
+        "series": pair.tweets.tweet_series(tweet_id),
+    })
+
 # -------------------------
 # CONFIGURATION
 # -------------------------
-dashboard_config = {
-    "pair_address": None,
-    "community_id": None,
-}
-
 def extract_community_id_from_url(twitter_url):
     try:
         if not twitter_url:
             return None
             
-        print(f"🔗 Processing Twitter URL: {twitter_url}")
+        log.info(f"🔗 Processing Twitter URL: {twitter_url}")
         
         if "communities/" in twitter_url:
             parts = twitter_url.split("communities/")
             if len(parts) > 1:
                 community_id = parts[1].split('/')[0].split('?')[0].strip()
                 if community_id.isdigit():
-                    print(f"✅ Extracted community ID: {community_id}")
+                    log.info(f"✅ Extracted community ID: {community_id}")
                     return community_id
         
-        print(f"❌ Could not extract community ID from URL: {twitter_url}")
+        log.warning(f"❌ Could not extract community ID from URL: {twitter_url}")
         return None
         
     except Exception as e:
-        print(f"❌ Error extracting community ID from URL: {e}")
+        log.error(f"❌ Error extracting community ID from URL: {e}")
         return None
 
-def update_x_urls_with_community_id(community_id):
-    global x_urls
-    
-    x_urls = {
-        "timeline": (
-            "https://x.com/i/api/graphql/Nyt-88UX4-pPCImZNUl9RQ/CommunityTweetsTimeline"
-            f"?variables=%7B%22communityId%22%3A%22{community_id}%22%2C%22count%22%3A20%2C%22displayLocation%22%3A%22Community%22%2C%22rankingMode%22%3A%22Relevance%22%2C%22withCommunity%22%3Atrue%7D"
-            "&features=%7B%22rweb_video_screen_enabled%22%3Afalse%2C%22payments_enabled%22%3Afalse%2C%22rweb_xchat_enabled%22%3Afalse%2C%22profile_label_improvements_pcf_label_in_post_enabled%22%3Atrue%2C%22rweb_tipjar_consumption_enabled%22%3Atrue%2C%22verified_phone_label_enabled%22%3Atrue%2C%22creator_subscriptions_tweet_preview_api_enabled%22%3Atrue%2C%22responsive_web_graphql_timeline_navigation_enabled%22%3Atrue%2C%22responsive_web_graphql_skip_user_profile_image_extensions_enabled%22%3Afalse%2C%22premium_content_api_read_enabled%22%3Afalse%2C%22communities_web_enable_tweet_community_results_fetch%22%3Atrue%2C%22c9s_tweet_anatomy_moderator_badge_enabled%22%3Atrue%2C%22responsive_web_grok_analyze_button_fetch_trends_enabled%22%3Afalse%2C%22responsive_web_grok_analyze_post_followups_enabled%22%3Atrue%2C%22responsive_web_jetfuel_frame%22%3Atrue%2C%22responsive_web_grok_share_attachment_enabled%22%3Atrue%2C%22articles_preview_enabled%22%3Atrue%2C%22responsive_web_edit_tweet_api_enabled%22%3Atrue%2C%22graphql_is_translatable_rweb_tweet_is_translatable_enabled%22%3Atrue%2C%22view_counts_everywhere_api_enabled%22%3Atrue%2C%22longform_notetweets_consumption_enabled%22%3Atrue%2C%22responsive_web_twitter_article_tweet_consumption_enabled%22%3Atrue%2C%22tweet_awards_web_tipping_enabled%22%3Afalse%2C%22responsive_web_grok_show_grok_translated_post%22%3Atrue%2C%22responsive_web_grok_analysis_button_from_backend%22%3Atrue%2C%22creator_subscriptions_quote_tweet_preview_enabled%22%3Afalse%2C%22freedom_of_speech_not_reach_fetch_enabled%22%3Atrue%2C%22standardized_nudges_misinfo%22%3Atrue%2C%22tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled%22%3Atrue%2C%22longform_notetweets_rich_text_read_enabled%22%3Atrue%2C%22longform_notetweets_inline_media_enabled%22%3Atrue%2C%22responsive_web_grok_image_annotation_enabled%22%3Atrue%2C%22responsive_web_grok_imagine_annotation_enabled%22%3Atrue%2C%22responsive_web_grok_community_note_auto_translation_is_enabled%22%3Afalse%2C%22responsive_web_enhance_cards_enabled%22%3Afalse%7D"
-        ),
-        "fetchOne": (
-            "https://x.com/i/api/graphql/pbuqwPzh0Ynrw8RQY3esYA/CommunitiesFetchOneQuery"
-            f"?variables=%7B%22communityId%22%3A%22{community_id}%22%2C%22withDmMuting%22%3Afalse%2C%22withGrokTranslatedBio%22%3Afalse%7D"
-            "&features=%7B%22payments_enabled%22%3Afalse%2C%22profile_label_improvements_pcf_label_in_post_enabled%22%3Atrue%2C%22responsive_web_graphql_skip_user_profile_image_extensions_enabled%22%3Afalse%2C%22responsive_web_graphql_timeline_navigation_enabled%22%3Atrue%2C%22rweb_tipjar_consumption_enabled%22%3Atrue%2C%22verified_phone_label_enabled%22%3Atrue%7D"
-        ),
-    }
-    
-    print(f"🔗 Updated X URLs with community ID: {community_id}")
-
 @app.route("/api/config", methods=["POST"])
 def update_config():
     try:
         config = request.get_json()
-        print("📩 Incoming config:", config)
+        log.info(f"📩 Incoming config: {config}")
 
         if not config.get("pairAddress"):
             return jsonify({"error": "Missing required field: pairAddress"}), 400
 
         pair_address = config["pairAddress"]
         user_community_id = config.get("communityId")
-        
-        # Update global variables
-        global PAIR_ADDRESS, community_id, axiom_endpoints
-        PAIR_ADDRESS = pair_address
-        
-        # Update Axiom endpoints
-        axiom_endpoints = {
-            "pair_info": f"https://api9.axiom.trade/pair-info?pairAddress={PAIR_ADDRESS}",
-            "token_info": f"https://api9.axiom.trade/token-info?pairAddress={PAIR_ADDRESS}",
-            "pair_stats": f"https://api9.axiom.trade/pair-stats?pairAddress={PAIR_ADDRESS}",
-            "token_holders": f"https://api10.axiom.trade/token-info?pairAddress={PAIR_ADDRESS}"
-        }
+        interval = config.get("fetchInterval")
+        if interval is not None:
+            try:
+                interval = float(interval)
+            except (TypeError, ValueError):
+                return jsonify({"error": "fetchInterval must be a number of seconds"}), 400
 
         # Extract community ID if not provided
         twitter_url = None
         if not user_community_id:
-            print("🔍 Fetching Axiom data to extract community ID...")
-            axiom_data = fetch_axiom_data()
+            log.info("🔍 Fetching Axiom data to extract community ID...")
+            axiom_data = fetch_axiom_data(build_axiom_endpoints(pair_address))
             pair_info = axiom_data.get("pair_info", {})
             twitter_url = pair_info.get("twitter")
             
@@ -905,7 +4218,7 @@ def update_config():
                 extracted_community_id = extract_community_id_from_url(twitter_url)
                 if extracted_community_id:
                     user_community_id = extracted_community_id
-                    print(f"✅ Extracted community ID: {user_community_id}")
+                    log.info(f"✅ Extracted community ID: {user_community_id}")
                 else:
                     return jsonify({
                         "error": "Could not extract community ID from Twitter URL",
@@ -919,14 +4232,10 @@ def update_config():
                     "suggestion": "Please provide communityId manually"
                 }), 400
 
-        community_id = user_community_id
-        dashboard_config["pair_address"] = PAIR_ADDRESS
-        dashboard_config["community_id"] = community_id
-
-        # Update X endpoints
-        update_x_urls_with_community_id(community_id)
+        # Track the pair (or update it if it is already tracked)
+        pair = track_pair(pair_address, user_community_id, interval)
 
-        print(f"✅ Configuration updated: {PAIR_ADDRESS}, {community_id}")
+        log.info(f"✅ Configuration updated: {pair.pair_address}, {pair.community_id}")
 
         # Initialize price data
         cached_sol_price["price"] = get_sol_usd_price()
@@ -936,59 +4245,112 @@ def update_config():
             "status": "success",
             "message": "Configuration updated and fetching started",
             "config": {
-                "pairAddress": PAIR_ADDRESS,
-                "communityId": community_id,
+                "pairAddress": pair.pair_address,
+                "communityId": pair.community_id,
+                "fetchInterval": pair.fetch_interval,
                 "twitterUrl": twitter_url,
                 "autoDiscovered": config.get("communityId") is None
-            }
+            },
+            "trackedPairs": len(pair_registry.pairs)
         }), 200
 
     except Exception as e:
-        print(f"❌ Error in config: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Error in config: {e}")
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/config", methods=["GET"])
 def get_config():
+    pair = pair_registry.get()
+    return jsonify({
+        "pairAddress": pair.pair_address if pair else None,
+        "communityId": pair.community_id if pair else None,
+        "pairs": [p.to_dict() for p in pair_registry.all()]
+    })
+
+@app.route("/api/pairs", methods=["GET"])
+def list_pairs():
     return jsonify({
-        "pairAddress": dashboard_config["pair_address"],
-        "communityId": dashboard_config["community_id"]
+        "default": pair_registry.default_address,
+        "pairs": [p.to_dict() for p in pair_registry.all()]
     })
 
+@app.route("/api/pairs/<pair_address>", methods=["DELETE"])
+def remove_pair(pair_address):
+    pair = untrack_pair(pair_address)
+    if not pair:
+        raise PairNotFound(pair_address)
+    log.info(f"🗑️ Stopped tracking {pair_address}")
+    return jsonify({"status": "success", "removed": pair_address, "trackedPairs": len(pair_registry.pairs)})
+
 @app.route("/api/status")
 def status():
+    pair = pair_registry.get()
     return jsonify({
         "status": "active",
-        "started_at": datetime.now().isoformat(),
-        "uptime_seconds": 0,
+        "started_at": datetime.fromtimestamp(STARTED_AT).isoformat(),
+        "uptime_seconds": round(time.time() - STARTED_AT, 1),
         "socket_connected": True,
-        "data_points": len(data_storage.get_all()),
-        "pair_address": PAIR_ADDRESS,
-        "community_id": community_id,
+        "data_points": len(pair.storage) if pair else 0,
+        "pair_address": pair.pair_address if pair else None,
+        "community_id": pair.community_id if pair else None,
+        "tracked_pairs": len(pair_registry.pairs),
+        "history_db": history_db.stats() if history_db else None,
+        "role": BX_ROLE,
+        "snapshot_bus": (snapshot_publisher or snapshot_subscriber).stats() if BX_ROLE != "all" else None,
         "is_fetching": is_fetching
     })
 
 # -------------------------
 # MAIN
 # -------------------------
+background_started = False
+
+def start_background_services():
+    # Once per process: from __main__, or from gunicorn's post_worker_init
+    # hook (gunicorn.conf.py) since workers never run __main__
+    global background_started
+    if background_started:
+        return
+    background_started = True
+    log.info(f"💾 Using in-memory storage{f' backed by {HISTORY_DB_PATH}' if history_db else ''} ({BX_ROLE} role)")
+
+    if BX_ROLE in ("all", "ingest"):
+        restore_saved_pairs()
+        log.info("🔧 Starting background threads...")
+        if upstream_replay:
+            threading.Thread(target=replay_fetcher, daemon=True).start()
+        else:
+            threading.Thread(target=update_sol_price, daemon=True).start()
+            threading.Thread(target=background_fetcher, daemon=True).start()
+        log.info("✅ Background threads started")
+    if snapshot_publisher:
+        snapshot_publisher.start()
+        # prometheus_client's start_http_server polls on a thread that
+        # would block the eventlet hub, so serve it from a green thread
+        eventlet.spawn_n(
+            eventlet.wsgi.server, eventlet.listen(("0.0.0.0", INGEST_METRICS_PORT)),
+            make_wsgi_app(metrics_registry), log_output=False,
+        )
+        log.info(f"📈 Ingest metrics on :{INGEST_METRICS_PORT}/metrics")
+    if snapshot_subscriber:
+        snapshot_subscriber.start()
+
 if __name__ == "__main__":
-    print("🚀 Starting Flask server with Socket.IO...")
-    print("💾 Using in-memory storage")
-    
-    # Start background threads
-    print("🔧 Starting background threads...")
-    threading.Thread(target=update_sol_price, daemon=True).start()
-    threading.Thread(target=background_fetcher, daemon=True).start()
-    print("✅ Background threads started")
+    start_background_services()
+
+    if BX_ROLE == "ingest":
+        log.info("✅ Ingest process running, web workers subscribe on " + SNAPSHOT_SOCKET)
+        while True:
+            time.sleep(3600)
 
-    print("✅ Server starting on http://0.0.0.0:5050")
+    log.info("🚀 Starting Flask server with Socket.IO...")
+    log.info(f"✅ Server starting on http://0.0.0.0:{os.environ.get('PORT', 5050)}")
     
     socketio.run(
         app,
         host="0.0.0.0",
-        port=5050,
-        debug=True,
+        port=int(os.environ.get("PORT", 5050)),
+        debug=os.environ.get("FLASK_DEBUG", "1") == "1",
         use_reloader=False,
         allow_unsafe_werkzeug=True
     )
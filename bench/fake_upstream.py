@@ -0,0 +1,279 @@
+# Local stand-in for the Axiom, X and CoinGecko endpoints Bx.py polls.
+#
+#   python bench/fake_upstream.py --port 8700 --latency 80 --holders 2000
+#
+# Listens on --port and the next two ports, so the three Axiom API hosts
+# (api6/api9/api10) get distinct addresses and their own pools and
+# breakers. Payloads are synthetic and change a little on every call, or
+# are read from --fixtures DIR/<source>.json when that file exists
+# (sources: pair_info, token_info, pair_stats, holders, timeline,
+# fetchOne, price).
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+ROUTES = {
+    "/pair-info": "pair_info",
+    "/token-info": "token_info",
+    "/pair-stats": "pair_stats",
+    "/holder-data-v3": "holders",
+    "/api/v3/simple/price": "price",
+}
+
+class Market:
+    # Per-pair state that drifts between calls like a live token would
+    def __init__(self, pair_address, args, rng):
+        self.pair_address = pair_address
+        self.args = args
+        self.rng = rng
+        self.price = 0.0001
+        self.buys = 0
+        self.sells = 0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.next_wallet = 0
+        self.wallets = {}
+        self.next_tweet = 10 ** 18
+        self.tweets = []
+        self.lock = threading.Lock()
+        for _ in range(args.holders):
+            self.add_wallet()
+        for _ in range(args.tweets):
+            self.add_tweet()
+
+    def add_wallet(self):
+        self.next_wallet += 1
+        funded = datetime.now(timezone.utc) - timedelta(days=self.rng.expovariate(1 / 90))
+        self.wallets[f"W{self.next_wallet:08d}"] = (funded.strftime("%Y-%m-%dT%H:%M:%S.000Z"), self.rng.uniform(1, 1e6))
+
+    def add_tweet(self):
+        self.next_tweet += 1
+        author = self.rng.randrange(max(1, self.args.tweets // 2))
+        self.tweets.insert(0, {
+            "id": str(self.next_tweet),
+            "author": author,
+            "created": datetime.now(timezone.utc).strftime("%a %b %d %H:%M:%S +0000 %Y"),
+            "views": self.rng.randrange(100, 10000),
+        })
+
+    def tick(self):
+        with self.lock:
+            self.price *= 1 + self.rng.gauss(0, 0.01)
+            buys, sells = self.rng.randrange(5), self.rng.randrange(5)
+            self.buys += buys
+            self.sells += sells
+            self.buy_volume += buys * self.rng.uniform(0.1, 2)
+            self.sell_volume += sells * self.rng.uniform(0.1, 2)
+            for _ in range(self.rng.randrange(3)):
+                self.add_wallet()
+            if self.wallets and self.rng.random() < 0.5:
+                self.wallets.pop(self.rng.choice(list(self.wallets)))
+
+    def pair_info(self):
+        return {
+            "pairAddress": self.pair_address,
+            "tokenAddress": f"T{self.pair_address}",
+            "tokenName": "Bench Token",
+            "tokenTicker": "BENCH",
+            "dexPaid": False,
+            "twitter": "https://x.com/i/communities/1000000000000000001",
+            "tokenImage": None,
+            "createdAt": "2026-01-01T00:00:00.000Z",
+            "supply": 1_000_000_000,
+            "initialLiquiditySol": 30,
+        }
+
+    def token_info(self):
+        return {
+            "numHolders": len(self.wallets),
+            "top10HoldersPercent": 21.5,
+            "insidersHoldPercent": 3.2,
+            "bundlersHoldPercent": 1.1,
+            "snipersHoldPercent": 0.4,
+        }
+
+    def pair_stats(self):
+        self.tick()
+        return [{
+            "priceSol": self.price,
+            "buyVolumeSol": self.buy_volume,
+            "sellVolumeSol": self.sell_volume,
+            "buyCount": self.buys,
+            "sellCount": self.sells,
+        }]
+
+    def holders(self):
+        return [
+            {"walletAddress": wallet, "walletFunding": {"fundedAt": funded}, "tokenBalance": balance}
+            for wallet, (funded, balance) in list(self.wallets.items())
+        ]
+
+    def timeline(self, cursor=None):
+        page_size = 20
+        if cursor is None and self.rng.random() < self.args.tweet_rate:
+            with self.lock:
+                self.add_tweet()
+        start = int(cursor) if cursor else 0
+        page = self.tweets[start:start + page_size]
+        entries = [tweet_entry(tweet, self.args.pad) for tweet in page]
+        if start + page_size < len(self.tweets):
+            entries.append({"content": {"cursorType": "Bottom", "value": str(start + page_size)}})
+        return {"data": {"communityResults": {"result": {"ranked_community_timeline": {"timeline": {
+            "instructions": [{"type": "TimelineAddEntries", "entries": entries}],
+        }}}}}}
+
+    def fetch_one(self):
+        return {"data": {"communityResults": {"result": {
+            "id_str": "1000000000000000001",
+            "name": "Bench Community",
+            "description": "Synthetic community",
+            "member_count": 1000 + len(self.tweets),
+            "admin_results": {"result": {
+                "core": {"name": "Bench Admin", "screen_name": "bench_admin"},
+                "legacy": {"followers_count": 5000, "statuses_count": 100, "description": ""},
+            }},
+        }}}}
+
+def tweet_entry(tweet, pad):
+    return {"content": {"itemContent": {"tweet_results": {"result": {
+        "__typename": "Tweet",
+        "rest_id": tweet["id"],
+        "legacy": {
+            "full_text": "gm " + "x" * pad,
+            "created_at": tweet["created"],
+            "retweet_count": 1,
+            "reply_count": 2,
+            "favorite_count": 3,
+        },
+        "core": {"user_results": {"result": {
+            "legacy": {"followers_count": 100 + tweet["author"]},
+            "core": {"name": f"Author {tweet['author']}", "screen_name": f"author{tweet['author']}"},
+        }}},
+        "views": {"count": str(tweet["views"])},
+    }}}}}
+
+class FakeUpstream:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.markets = {}
+        self.lock = threading.Lock()
+        self.fixtures = {}
+        if args.fixtures:
+            for name in ("pair_info", "token_info", "pair_stats", "holders", "timeline", "fetchOne", "price"):
+                path = os.path.join(args.fixtures, f"{name}.json")
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        self.fixtures[name] = f.read()
+        self.requests = 0
+
+    def market(self, pair_address):
+        with self.lock:
+            market = self.markets.get(pair_address)
+            if market is None:
+                market = self.markets[pair_address] = Market(pair_address, self.args, self.rng)
+            return market
+
+    def respond(self, path, query):
+        # (status, body bytes) for one request
+        self.requests += 1
+        if path == "/health":
+            return 200, b'{"ok": true}'
+        if self.rng.random() < self.args.error_rate:
+            return 503, b'{"error": "injected"}'
+
+        if "/CommunityTweetsTimeline" in path:
+            name = "timeline"
+        elif "/CommunitiesFetchOneQuery" in path:
+            name = "fetchOne"
+        else:
+            name = ROUTES.get(path)
+        if name is None:
+            return 404, b'{"error": "unknown endpoint"}'
+        if name in self.fixtures:
+            return 200, self.fixtures[name]
+
+        if name == "price":
+            return 200, json.dumps({"solana": {"usd": round(150 + self.rng.gauss(0, 1), 2)}}).encode()
+        if name in ("timeline", "fetchOne"):
+            variables = json.loads(query.get("variables", ["{}"])[0])
+            market = self.market(variables.get("communityId", "bench"))
+            if name == "fetchOne":
+                return 200, json.dumps(market.fetch_one()).encode()
+            return 200, json.dumps(market.timeline(variables.get("cursor"))).encode()
+
+        market = self.market(query.get("pairAddress", ["bench"])[0])
+        return 200, json.dumps(getattr(market, name)()).encode()
+
+    def delay(self):
+        if self.args.latency <= 0:
+            return
+        jitter = self.args.latency * self.args.jitter
+        time.sleep(max(0, self.rng.gauss(self.args.latency, jitter)) / 1000)
+
+def make_handler(upstream):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            upstream.delay()
+            status, body = upstream.respond(parts.path, parse_qs(parts.query))
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the upstream APIs")
+    parser.add_argument("--port", type=int, default=8700, help="first of three consecutive ports")
+    parser.add_argument("--latency", type=float, default=50, help="mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency stddev as a fraction of the mean")
+    parser.add_argument("--holders", type=int, default=500, help="wallets per pair")
+    parser.add_argument("--tweets", type=int, default=60, help="tweets per community at start")
+    parser.add_argument("--tweet-rate", type=float, default=0.3, help="chance of a new tweet per timeline call")
+    parser.add_argument("--pad", type=int, default=200, help="extra characters per tweet text")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--fixtures", help="directory of recorded payloads")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+def serve(args):
+    upstream = FakeUpstream(args)
+    handler = make_handler(upstream)
+    servers = [ThreadingHTTPServer(("127.0.0.1", args.port + i), handler) for i in range(3)]
+    for server in servers:
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return upstream, servers
+
+def base_urls(port):
+    # Environment that points Bx.py at a stand-in started on `port`
+    return {
+        "AXIOM_API6_URL": f"http://127.0.0.1:{port}",
+        "AXIOM_API9_URL": f"http://127.0.0.1:{port + 1}",
+        "AXIOM_API10_URL": f"http://127.0.0.1:{port + 2}",
+        "X_BASE_URL": f"http://127.0.0.1:{port}",
+        "COINGECKO_BASE_URL": f"http://127.0.0.1:{port}",
+    }
+
+if __name__ == "__main__":
+    args = parse_args()
+    serve(args)
+    print(f"🧪 Fake upstream on 127.0.0.1:{args.port}-{args.port + 2}", flush=True)
+    for key, value in base_urls(args.port).items():
+        print(f"   {key}={value}", flush=True)
+    while True:
+        time.sleep(3600)
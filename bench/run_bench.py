@@ -0,0 +1,290 @@
+# Offline benchmarks for Bx.py against bench/fake_upstream.py.
+#
+#   python bench/run_bench.py ticks   --pairs 3 --ticks 40
+#   python bench/run_bench.py routes  --concurrency 32 --requests 2000
+#   python bench/run_bench.py sockets --clients 200 --duration 20
+#   python bench/run_bench.py all
+#
+# ticks imports Bx in-process and times fetch_all_data (with per-phase
+# means from its metrics). routes and sockets start Bx.py as a server on
+# --server-port and load it over HTTP / Socket.IO. Every mode starts its
+# own fake upstream; --latency, --holders, --tweets and --pad shape it.
+# --json prints the results as one JSON object for comparing runs.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_upstream import base_urls  # noqa: E402
+
+ROUTES = [
+    "/api/data",
+    "/api/history?limit=500",
+    "/api/marketcap?points=300&downsample=lttb",
+    "/api/marketcap",
+    "/api/indicators",
+    "/api/buys-sells",
+    "/api/wallet-age",
+    "/api/social",
+    "/api/metrics",
+    "/api/fib-levels",
+    "/api/holders",
+    "/api/tweets",
+]
+
+PHASES = ["fetch", "holders", "build", "save", "emit"]
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def summary(values, scale=1000):
+    # Milliseconds by default
+    return {
+        "n": len(values),
+        "p50": round(percentile(values, 50) * scale, 2) if values else None,
+        "p99": round(percentile(values, 99) * scale, 2) if values else None,
+        "max": round(max(values) * scale, 2) if values else None,
+    }
+
+def bench_env(args):
+    env = dict(os.environ)
+    env.update(base_urls(args.upstream_port))
+    env.update({
+        "HISTORY_DB_PATH": "",
+        "LOG_LEVEL": "WARNING",
+        "FLASK_DEBUG": "0",
+        "PORT": str(args.server_port),
+        # websocket-client sends the server's own address as Origin
+        "SOCKETIO_EXTRA_ORIGINS": f"http://127.0.0.1:{args.server_port}",
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+def wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_upstream(args):
+    cmd = [
+        sys.executable, os.path.join(BENCH_DIR, "fake_upstream.py"),
+        "--port", str(args.upstream_port),
+        "--latency", str(args.latency),
+        "--holders", str(args.holders),
+        "--tweets", str(args.tweets),
+        "--pad", str(args.pad),
+        "--error-rate", str(args.error_rate),
+    ]
+    if args.fixtures:
+        cmd += ["--fixtures", args.fixtures]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    wait_for(f"http://127.0.0.1:{args.upstream_port}/health")
+    return proc
+
+def start_server(args):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "Bx.py")],
+        cwd=REPO_DIR, env=bench_env(args),
+        stdout=subprocess.DEVNULL if not args.verbose else None,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+    server = f"http://127.0.0.1:{args.server_port}"
+    wait_for(f"{server}/api/status")
+    for i in range(args.pairs):
+        resp = requests.post(f"{server}/api/config", json={
+            "pairAddress": f"BENCHPAIR{i}",
+            "communityId": f"10000000000000000{i:02d}",
+            "fetchInterval": args.interval,
+        }, timeout=30)
+        resp.raise_for_status()
+    return proc, server
+
+def run_ticks(args):
+    os.environ.update(bench_env(args))
+    sys.path.insert(0, REPO_DIR)
+    import Bx
+
+    Bx.cached_sol_price["price"] = 150
+    pairs = [Bx.pair_registry.add(f"BENCHPAIR{i}", f"10000000000000000{i:02d}", args.interval) for i in range(args.pairs)]
+    durations = []
+    for _ in range(args.ticks):
+        for pair in pairs:
+            if args.all_sources:
+                for source in pair.sources.values():
+                    source.next_at = 0
+            started = time.perf_counter()
+            Bx.fetch_all_data(pair)
+            durations.append(time.perf_counter() - started)
+        time.sleep(args.interval)
+
+    def sample(name, labels=None):
+        return Bx.metrics_registry.get_sample_value(name, labels or {}) or 0
+
+    phases = {}
+    for phase in PHASES:
+        count = sample("kluxback_tick_phase_seconds_count", {"phase": phase})
+        total = sample("kluxback_tick_phase_seconds_sum", {"phase": phase})
+        phases[phase] = round(total / count * 1000, 2) if count else None
+    return {
+        "tick_ms": summary(durations),
+        "phase_mean_ms": phases,
+        "ticks": {outcome: sample("kluxback_ticks_total", {"outcome": outcome}) for outcome in ("saved", "skipped", "error")},
+        "storage_bytes": sum(pair.storage.nbytes() for pair in pairs),
+    }
+
+def run_routes(args, server):
+    time.sleep(args.warmup)
+    session_local = threading.local()
+    latencies = {route: [] for route in ROUTES}
+    errors = {route: 0 for route in ROUTES}
+
+    def hit(i):
+        session = getattr(session_local, "session", None)
+        if session is None:
+            session = session_local.session = requests.Session()
+        route = ROUTES[i % len(ROUTES)]
+        pair = f"BENCHPAIR{i % args.pairs}"
+        url = f"{server}{route}{'&' if '?' in route else '?'}pair={pair}"
+        started = time.perf_counter()
+        try:
+            resp = session.get(url, timeout=30)
+            resp.content
+            if resp.status_code >= 400:
+                errors[route] += 1
+        except requests.RequestException:
+            errors[route] += 1
+        latencies[route].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(hit, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": round(args.requests / elapsed, 1),
+        "routes": {route: {**summary(latencies[route]), "errors": errors[route]} for route in ROUTES},
+    }
+
+def run_sockets(args, server):
+    import socketio
+
+    received = []
+    lags = []
+    lock = threading.Lock()
+    clients = []
+
+    def on_update(data):
+        now = time.time()
+        with lock:
+            received.append(now)
+            if isinstance(data, dict) and data.get("timestamp"):
+                lags.append(now - datetime.fromisoformat(data["timestamp"]).timestamp())
+
+    for i in range(args.clients):
+        client = socketio.Client(reconnection=False)
+        client.on("data_update", on_update)
+        client.on("data_patch", on_update)
+        query = f"pair=BENCHPAIR{i % args.pairs}"
+        if args.patch:
+            query += "&mode=patch"
+        client.connect(f"{server}?{query}", transports=["websocket"], wait_timeout=10)
+        clients.append(client)
+
+    time.sleep(args.warmup)
+    with lock:
+        received.clear()
+        lags.clear()
+    time.sleep(args.duration)
+    with lock:
+        count = len(received)
+        lag_values = list(lags)
+    debug = requests.get(f"{server}/api/socket-debug", timeout=10).json()
+    for client in clients:
+        client.disconnect()
+    return {
+        "clients": len(clients),
+        "messages_per_second": round(count / args.duration, 1),
+        "lag_ms": summary(lag_values),
+        "outbox": debug.get("outbox"),
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for Bx.py")
+    parser.add_argument("mode", choices=["ticks", "routes", "sockets", "all"])
+    parser.add_argument("--pairs", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=1, help="fetch interval per pair in seconds")
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--all-sources", action="store_true", help="force every source due on every tick")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--patch", action="store_true", help="socket clients use patch mode")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=50, help="fake upstream latency in ms")
+    parser.add_argument("--holders", type=int, default=500)
+    parser.add_argument("--tweets", type=int, default=60)
+    parser.add_argument("--pad", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures")
+    parser.add_argument("--upstream-port", type=int, default=8700)
+    parser.add_argument("--server-port", type=int, default=5099)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="show the server's output")
+    return parser.parse_args()
+
+def report(mode, result, as_json):
+    if as_json:
+        print(json.dumps({mode: result}))
+        return
+    print(f"\n=== {mode} ===")
+    print(json.dumps(result, indent=2))
+
+def main():
+    args = parse_args()
+    if args.mode == "all":
+        # One process per mode: ticks monkey-patches the interpreter
+        argv = [a for a in sys.argv[1:] if a != "all"]
+        for mode in ("ticks", "routes", "sockets"):
+            subprocess.run([sys.executable, os.path.abspath(__file__), mode, *argv], check=True)
+        return
+
+    upstream = start_upstream(args)
+    server = None
+    try:
+        if args.mode == "ticks":
+            result = run_ticks(args)
+        else:
+            server, url = start_server(args)
+            result = run_routes(args, url) if args.mode == "routes" else run_sockets(args, url)
+        report(args.mode, result, args.json)
+    finally:
+        for proc in (server, upstream):
+            if proc:
+                proc.terminate()
+                proc.wait(timeout=10)
+    # Bx's background threads are daemons; skip waiting on them
+    os._exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Gunicorn never runs Bx.py's __main__ block, so start the fetcher (or the
+# snapshot subscriber in the web role) once each worker is up
+def post_worker_init(worker):
+    import Bx
+    Bx.start_background_services()
@@ -1,2 +1,22 @@
 #!/bin/bash
-gunicorn --worker-class eventlet -w 1 Bx:app
\ No newline at end of file
+# WEB_WORKERS > 1 runs the fetcher as its own ingest process and has the
+# web workers mirror its snapshots over the Unix socket bus. Gunicorn has
+# no sticky sessions, so the web role serves Socket.IO over WebSocket only
+# (SOCKETIO_TRANSPORTS); dashboard clients must use transports: ["websocket"]
+WEB_WORKERS=${WEB_WORKERS:-1}
+
+if [ "$WEB_WORKERS" -le 1 ]; then
+  exec gunicorn --worker-class eventlet -w "$WEB_WORKERS" -c gunicorn.conf.py Bx:app
+fi
+
+# Ingest and gunicorn run side by side; when either exits the other is
+# stopped and the script exits non-zero so the platform restarts both
+BX_ROLE=ingest python Bx.py &
+BX_ROLE=web gunicorn --worker-class eventlet -w "$WEB_WORKERS" -c gunicorn.conf.py Bx:app &
+trap 'kill -TERM $(jobs -p) 2>/dev/null' TERM INT
+
+wait -n
+status=$?
+kill -TERM $(jobs -p) 2>/dev/null
+wait
+exit $(( status == 0 ? 1 : status ))
@@ -0,0 +1,46 @@
+import os
+import sys
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("HISTORY_DB_PATH", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Bx  # noqa: E402
+
+
+def streamed_snapshot():
+    # Numbers as the ijson parser and the ring buffer hand them over
+    return {
+        "timestamp": "2026-01-01T00:00:00",
+        "version": 3,
+        "axiom": {
+            "marketCapUSD": Decimal("15234.125"),
+            "buyVolumeSol": Decimal("1.5"),
+            "numHolders": np.int64(42),
+            "holders": [{"walletAddress": "W1", "tokenBalance": Decimal("0.25")}],
+        },
+        "social": {"views": 10},
+        "indicators": {"mcEma1m": np.float64(15000.5)},
+        "unique_authors": 1,
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_snapshot_with_decimal_values(tmp_path, monkeypatch, use_orjson):
+    monkeypatch.setattr(Bx, "ORJSON_AVAILABLE", use_orjson and Bx.ORJSON_AVAILABLE)
+    db = Bx.HistoryDB(str(tmp_path / "history.db"))
+
+    db._write([("PAIR", streamed_snapshot(), None)])
+
+    assert db.written == 1
+    latest = db.latest_snapshot("PAIR")
+    assert latest["axiom"]["marketCapUSD"] == 15234.125
+    assert latest["axiom"]["numHolders"] == 42
+    assert latest["axiom"]["holders"][0]["tokenBalance"] == 0.25
+    assert latest["indicators"]["mcEma1m"] == 15000.5
+    lists = db.query("PAIR")
+    assert lists["marketCapUSD"] == [15234.125]
+    assert lists["numHolders"] == [42]